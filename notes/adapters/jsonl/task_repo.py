@@ -1,30 +1,48 @@
 from notes.ports.task_repository import TaskRepository
-from notes.domain.task import Task, TaskId
+from notes.domain.task import Cursor, Task, TaskId
 from notes.domain.errors import TaskAlreadyExistsError, TaskNotFoundError, TaskValidationError, DomainError
 from pathlib import Path
-from typing import Iterable
-from dataclasses import asdict
+from typing import Iterable, Iterator, Literal, Sequence
+from itertools import islice
+from operator import attrgetter
+from dataclasses import replace
+from heapq import nsmallest
+from bisect import bisect_left, bisect_right
 from notes.domain.enums import TaskStatus
 from datetime import datetime, timezone
-import os, json
+import os, mmap
+import orjson
 
-ALLOWED = {"Open", "In Progress", "Closed"}
+_STATUS_BY_VALUE = {s.value: s for s in TaskStatus}
+_DELETED = "__deleted__"  # znacznik rekordu usunięcia w logu JSONL
+_IO_BUFFER = 1 << 16  # 64 KiB bufora zapisu przy przepisywaniu pliku
 
 def _encode_task(task: Task) -> dict:
     return {
         "task_id": str(task.task_id),
         "title": task.title,
         "description": task.description,
-        "created_at": task.created_at.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
-        "status": task.status.value if isinstance(task.status, TaskStatus) else str(task.status),  # enum -> str
+        "created_at": _as_utc(task.created_at),  # orjson zapisze datetime jako ISO8601 z 'Z'
+        "status": task.status.value,  # enum -> str (domena gwarantuje TaskStatus)
     }
 
+# klucze sortowania (pole, task_id) — attrgetter działa w C, bez wywołań lambdy per element
+_ORDER_KEYS = {
+    "created_at": attrgetter("created_at", "task_id"),
+    "title": attrgetter("title", "task_id"),
+}
+_order_key = _ORDER_KEYS["created_at"]  # kolejność utrzymywana w cache
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is timezone.utc else dt.astimezone(timezone.utc)
+
+_json_loads = orjson.loads
+
+def _dumps(rec: dict) -> bytes:
+    return orjson.dumps(rec, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC)
+
 def _decode_task(row: dict) -> Task:
-    raw = row.get("status", "Open")
-    try:
-        status = raw if isinstance(raw, TaskStatus) else TaskStatus(raw)  # str -> enum
-    except ValueError:
-        status = TaskStatus.OPEN  # defensywny fallback
+    status = _STATUS_BY_VALUE.get(row.get("status"), TaskStatus.OPEN)  # str -> enum, defensywny fallback
 
     return Task(
         task_id=TaskId(row["task_id"]),
@@ -36,78 +54,304 @@ def _decode_task(row: dict) -> Task:
 
 def _parse_utc_z(s: str) -> datetime:
     """Parsuje datę w formacie ISO8601 zakończoną literą 'Z' (UTC)."""
-    if not isinstance(s, str) or not s.endswith("Z"):
+    if type(s) is not str or not s.endswith("Z"):
         raise ValueError("created_at must be ISO8601 UTC with 'Z'")
-    return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc)
+    dt = datetime.fromisoformat(s)  # Python 3.11+ rozumie sufiks 'Z'
+    return dt if dt.tzinfo is timezone.utc else dt.astimezone(timezone.utc)
 
 class JsonlTaskRepository(TaskRepository):
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, durable: bool | None = None, flush_every: int = 1) -> None:
         """Inicjalizuje repozytorium JSONL.
-        Tworzy katalog nadrzędny dla pliku, jeśli nie istnieje."""
+        Tworzy katalog nadrzędny dla pliku, jeśli nie istnieje.
+
+        :param durable: Czy robić fsync pliku (i katalogu po podmianie).
+            Domyślnie True; `NOTES_DURABLE=0` wyłącza (testy, CI).
+        :param flush_every: Po ilu dopisanych rekordach zapisać bufor na dysk
+            (jeden `write` + jeden `fsync`). 1 = każdy zapis od razu;
+            przy większych wartościach wywołujący odpowiada za `flush()`."""
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        if durable is None:
+            durable = os.environ.get("NOTES_DURABLE", "1") != "0"
+        self.durable = durable
+        # cache: wczytane zadania + (mtime_ns, size) pliku z chwili wczytania/zapisu
+        self._cache: dict[str, Task] | None = None
+        self._stat: tuple[int, int] | None = None
+        self._lines = 0  # liczba rekordów w pliku (łącznie z nadpisanymi i usuniętymi)
+        self._sorted = False  # czy kolejność cache == (created_at, task_id) ASC
+        # posortowane klucze (created_at, task_id) pod bisect w list_after; ważne tylko przy _sorted
+        self._keys: list[tuple[datetime, str]] | None = None
+        self.flush_every = max(1, int(flush_every))
+        self._pending = bytearray()  # dopisane rekordy czekające na flush()
+        self._pending_count = 0
+        self._fd: int | None = None  # deskryptor O_APPEND, otwierany przy pierwszym flush()
 
+    def _append_fd(self) -> int:
+        """Zwraca (otwierany leniwie) deskryptor do dopisywania na końcu pliku."""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
 
-    def _load_tasks(self) -> dict[str, Task]:
-        tasks: dict[str, Task] = {}
+    def _close_fd(self) -> None:
+        """Zamyka deskryptor dopisywania (np. przed podmianą pliku)."""
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+    def close(self) -> None:
+        """Zapisuje bufor i zwalnia deskryptor pliku."""
         try:
-            with self.path.open("r", encoding="utf-8") as f:
-                for lineno, line in enumerate(f, start=1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                    except json.JSONDecodeError as e:
-                        raise TaskValidationError(f"{self.path.name}:{lineno}: invalid JSON: {e}")
-
-                    try:
-                        task = _decode_task(record)
-                    except (KeyError, ValueError) as e:
-                        raise TaskValidationError("record", f"{self.path.name}:{lineno}: {e}")
-
-                    key = str(task.task_id)  # klucz zawsze jako string
-                    if key in tasks:
-                        raise TaskValidationError("record", f"{self.path.name}:{lineno}: duplicate task_id '{key}'")
-                    tasks[key] = task
+            self.flush()
+        finally:
+            self._close_fd()
+
+    def __del__(self) -> None:
+        try:
+            self._close_fd()
+        except Exception:
+            pass
+
+    def _file_stat(self) -> tuple[int, int] | None:
+        """Zwraca (mtime_ns, size) pliku albo None, jeśli plik nie istnieje."""
+        try:
+            st = os.stat(self.path)
         except FileNotFoundError:
-            return {}
+            return None
         except OSError as e:
             raise DomainError(str(e))
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_tasks(self) -> dict[str, Task]:
+        """Zwraca zadania z cache; plik czyta ponownie tylko, gdy zmienił się z zewnątrz."""
+        stat = self._file_stat()
+        if self._cache is not None and stat == self._stat:
+            return self._cache
+        # plik mógł zostać podmieniony (np. kompakcja w innym procesie) — stary deskryptor
+        # wskazywałby na nieaktualny i-węzeł, więc otworzymy go ponownie przy flush()
+        self._close_fd()
+        if self._pending and self._cache is not None:
+            # plik zmienił się z zewnątrz — najpierw dopisz nasze rekordy, potem przeładuj log
+            self.flush()
+            stat = self._stat
+        tasks, lines = self._read_tasks()
+        self._cache = tasks
+        self._stat = stat
+        self._lines = lines
+        self._sorted = False
+        return tasks
+
+    def _sorted_tasks(self) -> dict[str, Task]:
+        """Zwraca cache ułożony wg (created_at, task_id).
+
+        Sortuje tylko, gdy kolejność mogła się zepsuć (przeładowanie pliku, wstawienie
+        „w środek”). Zwykle zadania przychodzą z rosnącym created_at, więc kolejne
+        `add` utrzymują porządek i `list_all` nie sortuje wcale."""
+        tasks = self._load_tasks()
+        if not self._sorted:
+            # Timsort na prawie posortowanych danych jest ~O(N)
+            tasks = {t.task_id: t for t in sorted(tasks.values(), key=_order_key)}
+            self._cache = tasks
+            self._sorted = True
+            self._keys = None  # indeks z poprzedniego porządku jest nieaktualny
         return tasks
 
+    def _key_index(self, tasks: dict[str, Task]) -> list[tuple[datetime, str]]:
+        """Zwraca posortowane klucze (created_at, task_id) dla wyniku `_sorted_tasks()`.
+
+        Budowany raz po sortowaniu, potem aktualizowany przyrostowo (`add` na końcu,
+        `remove`) — strona keyset to bisect + wycinek, bez kopiowania całego cache."""
+        if self._keys is None:
+            self._keys = [(t.created_at, key) for key, t in tasks.items()]
+        return self._keys
+
+    def _iter_records(self) -> Iterator[tuple[int, dict]]:
+        """Strumieniuje rekordy (numer linii, dict) z pliku — jeden na raz, bez list.
+
+        Plik jest mapowany przez mmap; granice linii szuka `find(b"\\n")` (memchr w C)."""
+        try:
+            with self.path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return  # mmap nie obsługuje pustych plików
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    loads = _json_loads
+                    size = len(mm)
+                    start = 0
+                    lineno = 0
+                    while start < size:
+                        end = mm.find(b"\n", start)
+                        if end == -1:
+                            end = size
+                        lineno += 1
+                        line = mm[start:end]  # bez '\n'; ewentualne '\r' parser JSON pominie
+                        start = end + 1
+                        if not line or line.isspace():  # isspace() kończy na pierwszym znaku, nie kopiuje
+                            continue
+                        try:
+                            record = loads(line)  # bytes prosto z mmap — bez dekodowania do str
+                        except ValueError as e:
+                            raise TaskValidationError("record", f"{self.path.name}:{lineno}: invalid JSON: {e}")
+                        yield lineno, record
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            raise DomainError(str(e))
+
+    def _read_tasks(self) -> tuple[dict[str, Task], int]:
+        """Odtwarza stan z logu.
+
+        Późniejszy rekord o tym samym `task_id` nadpisuje wcześniejszy,
+        a rekord z `"__deleted__": true` usuwa zadanie. Zwraca (zadania, liczba rekordów)."""
+        tasks: dict[str, Task] = {}
+        records = 0
+        for lineno, record in self._iter_records():
+            records += 1
+            if record.get(_DELETED):
+                tasks.pop(str(record.get("task_id")), None)
+                continue
+
+            try:
+                task = _decode_task(record)
+            except (KeyError, ValueError) as e:
+                raise TaskValidationError("record", f"{self.path.name}:{lineno}: {e}")
+
+            key = str(task.task_id)  # klucz zawsze jako string
+            tasks[key] = task  # ostatni wygrywa
+        return tasks, records
+
 
 
     def _atomic_dump(self, tasks: Iterable[Task]) -> None:
         tmp = self.path.with_suffix(self.path.suffix + ".swap")
         try:
-            with tmp.open("w", encoding="utf-8", newline="\n") as f:
+            with tmp.open("wb", buffering=_IO_BUFFER) as f:  # jeden flush na końcu
+                # lokalne referencje → LOAD_FAST w pętli zamiast LOAD_GLOBAL/LOAD_ATTR
+                encode, dumps, write = _encode_task, _dumps, f.write
+                lines = 0
                 for t in tasks:
-                    rec = _encode_task(t)  # enum -> str, TaskId -> str, datetime -> Z
-                    f.write(json.dumps(rec, ensure_ascii=False))
-                    f.write("\n")
+                    write(dumps(encode(t)))  # enum -> str, TaskId -> str, datetime -> Z
+                    write(b"\n")
+                    lines += 1
                 f.flush()
-                os.fsync(f.fileno())
+                if self.durable:
+                    os.fsync(f.fileno())
+            self._close_fd()  # deskryptor wskazuje na stary plik (i blokowałby podmianę na Windows)
             os.replace(tmp, self.path)
+            if self.durable:
+                self._fsync_dir()
         except OSError as e:
+            self._cache = None  # cache mógł już zostać zmieniony — wymuś ponowny odczyt
             try:
                 if tmp.exists():
                     tmp.unlink()
             except OSError:
                 pass
             raise DomainError(str(e))
+        self._stat = self._file_stat()
+        self._lines = lines
+        self._pending.clear()  # zrzut zawiera pełny stan cache, łącznie z buforem
+        self._pending_count = 0
+
+    def _fsync_dir(self) -> None:
+        """fsync katalogu nadrzędnego — bez tego rename/utworzenie pliku nie jest trwałe (POSIX)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return  # Windows: brak fsync katalogów
+        dir_fd = os.open(self.path.parent, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _append(self, rec: dict) -> None:
+        """Dopisuje jeden rekord do bufora; co `flush_every` rekordów bufor trafia na dysk."""
+        self._pending += _dumps(rec)
+        self._pending += b"\n"
+        self._pending_count += 1
+        self._lines += 1
+        if self._pending_count >= self.flush_every:
+            self.flush()
+        self._maybe_compact()
+
+    def flush(self) -> None:
+        """Zapisuje zbuforowane rekordy na końcu pliku: jeden `write` i (opcjonalnie) jeden `fsync`."""
+        if not self._pending:
+            return
+        created = self._stat is None
+        try:
+            # bajty z orjson idą prosto do deskryptora — bez TextIOWrapper i kodowania per linia
+            fd = self._append_fd()
+            written = os.write(fd, self._pending)
+            while written < len(self._pending):  # częściowy zapis (rzadkie, np. sygnał)
+                written += os.write(fd, self._pending[written:])
+            if self.durable:
+                os.fsync(fd)
+            if self.durable and created:
+                self._fsync_dir()  # nowy wpis w katalogu też musi być trwały
+        except OSError as e:
+            self._cache = None
+            self._close_fd()
+            raise DomainError(str(e))
+        finally:
+            self._pending.clear()
+            self._pending_count = 0
+        self._stat = self._file_stat()
+
+    def _maybe_compact(self) -> None:
+        """Kompaktuje log, gdy martwe rekordy stanowią ponad połowę pliku."""
+        if self._cache is not None and self._lines > 2 * len(self._cache):
+            self.compact()
+
+    def compact(self) -> None:
+        """Przepisuje plik atomowo na podstawie aktualnego stanu (jeden rekord na zadanie)."""
+        self._atomic_dump(self._load_tasks().values())
 
     def add(self, task: Task) -> None:
         """Dodaje nowy Task do repozytorium.
         Rzuca TaskAlreadyExistsError, jeśli task_id już istnieje.
-        Zapisuje dane w sposób atomowy."""
+        Rekord jest dopisywany na końcu pliku (append), bez przepisywania całości."""
 
         tasks = self._load_tasks()
         key = str(task.task_id)
         if key in tasks:
             raise TaskAlreadyExistsError(task.task_id)
+        if self._sorted and tasks and _order_key(task) < _order_key(next(reversed(tasks.values()))):
+            self._sorted = False  # wstawienie „w środek” — posortujemy przy następnym list_all
+        elif self._sorted and self._keys is not None:
+            self._keys.append((task.created_at, key))
         tasks[key] = task
-        self._atomic_dump(tasks.values())
+        self._append(_encode_task(task))
+
+
+    def add_many(self, tasks: Sequence[Task]) -> None:
+        """Dodaje paczkę zadań — wszystko albo nic.
+        Najpierw sprawdza kolizje, potem dopisuje wszystkie rekordy do bufora
+        i zapisuje je jednym `write` (+ jednym `fsync`)."""
+
+        cache = self._load_tasks()
+        seen: set[str] = set()
+        for task in tasks:
+            key = str(task.task_id)
+            if key in cache or key in seen:
+                raise TaskAlreadyExistsError(task.task_id)
+            seen.add(key)
+        if not tasks:
+            return
+
+        last = next(reversed(cache.values()), None) if self._sorted else None
+        dumps, encode, pending = _dumps, _encode_task, self._pending
+        for task in tasks:
+            if last is not None and _order_key(task) < _order_key(last):
+                self._sorted = False  # wstawienie „w środek” — posortujemy przy list_all
+            last = task
+            key = str(task.task_id)
+            if self._sorted and self._keys is not None:
+                self._keys.append((task.created_at, key))
+            cache[key] = task
+            pending += dumps(encode(task))
+            pending += b"\n"
+        self._pending_count += len(tasks)
+        self._lines += len(tasks)
+        self.flush()  # paczka = granica zapisu, niezależnie od flush_every
+        self._maybe_compact()
 
 
     def get(self, task_id: TaskId) -> Task:
@@ -121,46 +365,114 @@ class JsonlTaskRepository(TaskRepository):
 
 
     def update(self, task: Task) -> None:
-        """Aktualizuje istniejący Task w repozytorium."""
+        """Aktualizuje istniejący Task w repozytorium.
+        Nowa wersja rekordu jest dopisywana na końcu pliku (ostatni wygrywa)."""
 
         tasks = self._load_tasks()
         key = str(task.task_id)
         if key not in tasks:
             raise TaskNotFoundError(task.task_id)
+        if tasks[key].created_at != task.created_at:
+            self._sorted = False
         tasks[key] = task
-        self._atomic_dump(tasks.values())
+        self._append(_encode_task(task))
+
+
+    def transition_status(self, task_id: TaskId, new_status: TaskStatus) -> Task | None:
+        """Zmienia status zadania (dopisuje nową wersję rekordu).
+        Zwraca zadanie po zmianie, bez zapisu gdy status się nie zmienia, albo None, gdy brak ID."""
+
+        tasks = self._load_tasks()
+        key = str(task_id)
+        old = tasks.get(key)
+        if old is None or old.status is new_status:  # członkowie Enum są singletonami
+            return old
+        task = replace(old, status=new_status)  # kopia z jedną zmienioną kolumną
+        tasks[key] = task  # created_at bez zmian — porządek cache zostaje
+        self._append(_encode_task(task))
+        return task
+
+
+    def set_status(self, task_id: TaskId, new_status: TaskStatus) -> bool:
+        """Ustawia status; True przy zmianie (dopisany rekord), False gdy status ten sam.
+        Rzuca TaskNotFoundError, jeśli nie istnieje."""
+
+        old = self._load_tasks().get(str(task_id))
+        if old is None:
+            raise TaskNotFoundError(task_id)
+        return self.transition_status(task_id, new_status) is not old
 
 
     def remove(self, task_id: TaskId) -> None:
         """Usuwa Task o podanym ID.
         Rzuca TaskNotFoundError, jeśli nie istnieje.
-        Zapis wykonywany atomowo."""
+        Dopisuje znacznik usunięcia (tombstone) zamiast przepisywać plik."""
 
         tasks = self._load_tasks()
         key = str(task_id)
         if key not in tasks:
             raise TaskNotFoundError(task_id)
+        keys = self._keys
+        if self._sorted and keys is not None:
+            del keys[bisect_left(keys, (tasks[key].created_at, key))]
         del tasks[key]
-        self._atomic_dump(tasks.values())
-
-    def list_all(self, offset: int = 0, limit: int | None = None) -> Iterable[Task]:
-        """Zwraca listę Tasków posortowaną rosnąco po created_at,
-        z tiebreakerem po task_id. Następnie stosuje paginację offset/limit."""
-        tasks = list(self._load_tasks().values())
+        self._append({"task_id": key, _DELETED: True})
 
-        # sort → (created_at ASC, task_id ASC)
-        tasks.sort(key=lambda t: (t.created_at, t.task_id))
+    def list_all(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        order_by: Literal["created_at", "title"] | None = None,
+    ) -> Iterable[Task]:
+        """Zwraca Taski posortowane rosnąco po `order_by` (domyślnie created_at),
+        z tiebreakerem po task_id. Następnie stosuje paginację offset/limit.
+        Cache jest utrzymywany w kolejności created_at, więc strona to O(offset + limit);
+        dla "title" sortujemy przy odczycie (nsmallest, gdy jest limit)."""
+        order_by = order_by or "created_at"
+        if order_by not in _ORDER_KEYS:
+            raise TaskValidationError("order_by", f"Nieobsługiwane pole: {order_by}")
 
         # normalizacja parametrów
         start = max(0, int(offset))
+        if order_by != "created_at":
+            keyfn = _ORDER_KEYS[order_by]
+            tasks = self._load_tasks().values()
+            if limit is None:
+                return sorted(tasks, key=keyfn)[start:]
+            if limit <= 0:
+                return []
+            return nsmallest(start + int(limit), tasks, key=keyfn)[start:]
+
+        tasks = self._sorted_tasks().values()
         if limit is None:
-            return tasks[start:]
+            return list(islice(tasks, start, None))
         if limit <= 0:
             return []
 
-        end = start + int(limit)
-        return tasks[start:end]
+        # kopia strony — cache może się zmienić, zanim wywołujący skończy iterować
+        return list(islice(tasks, start, start + int(limit)))
+
+
+    def list_all_with_total(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        order_by: Literal["created_at", "title"] | None = None,
+    ) -> tuple[list[Task], int]:
+        """Strona (jak `list_all`) + liczba wszystkich zadań, z jednego wczytania cache."""
+        return list(self.list_all(offset=offset or 0, limit=limit, order_by=order_by)), self.count_all()
 
+    def list_after(self, cursor: Cursor | None, limit: int) -> tuple[list[Task], Cursor | None]:
+        """Zwraca stronę za kursorem (keyset): bisect po (created_at, task_id) w posortowanym cache.
+        Zwraca też kursor następnej strony albo None, gdy to koniec. Rzuca TaskValidationError, gdy limit < 1."""
+        if limit < 1:
+            raise TaskValidationError("pagination", "limit > 0")
+        tasks = self._sorted_tasks()
+        keys = self._key_index(tasks)
+        start = 0 if cursor is None else bisect_right(keys, (cursor.created_at, str(cursor.task_id)))
+        page = keys[start:start + limit + 1]  # +1 → wiemy, czy jest następna strona
+        items = [tasks[key] for _, key in page[:limit]]
+        return items, (Cursor.after(items[-1]) if len(page) > limit else None)
 
     def count_all(self) -> int:
         """Zwraca liczbę wszystkich Tasków w repozytorium."""
@@ -1,6 +1,16 @@
-from notes.domain.task import Task, TaskId
+from notes.domain.task import Cursor, Task, TaskId
+from notes.domain.enums import TaskStatus
 from notes.domain.errors import TaskAlreadyExistsError, TaskNotFoundError, TaskValidationError
-from typing import Iterable, Optional, Literal
+from typing import Iterable, Iterator, Optional, Literal, Sequence
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
+from dataclasses import replace
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # czysty Python bez mypy — dekorator niczego nie zmienia
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore[misc]
+        return lambda cls: cls
 
 ### COMMENTS
 # ==========================================================
@@ -10,6 +20,8 @@ from typing import Iterable, Optional, Literal
 #
 # - Służy do testów, prototypowania i poziomu Level 1 (bez trwałego zapisu).
 # - Dane przechowywane są w słowniku `_data: dict[TaskId, Task]`.
+# - Indeksy wtórne: listy posortowane wg (created_at, task_id) i (title, task_id),
+#   aktualizowane przy add/update/remove (bisect) — list_all tylko tnie, nie sortuje.
 # - Wszystkie operacje działają w czasie życia obiektu (brak trwałości między uruchomieniami).
 # - Zasady zgodne z kontraktem portu:
 #     * `add`  → zgłasza `TaskAlreadyExistsError`, jeśli ID istnieje,
@@ -22,6 +34,15 @@ from typing import Iterable, Optional, Literal
 
 
 
+# order_by -> klucz indeksu wtórnego (tiebreaker po task_id)
+_INDEX_KEYS = {
+    "created_at": attrgetter("created_at", "task_id"),
+    "title": attrgetter("title", "task_id"),
+}
+
+
+# skompilowana klasa domyślnie nie pozwala na dziedziczenie z kodu interpretowanego (np. testy)
+@mypyc_attr(allow_interpreted_subclasses=True)
 class InMemoryTaskRepository:
     """
         Inicjalizuje repozytorium z opcjonalną kolekcją startowych zadań.
@@ -35,6 +56,19 @@ class InMemoryTaskRepository:
         self._data = {}
         for t in (initial or []):
             self._data[t.task_id] = t  # load each Task by ID
+        # indeksy wtórne: order_by -> lista Tasków posortowana po kluczu z _INDEX_KEYS
+        self._indexes: dict[str, list[Task]] = {
+            name: sorted(self._data.values(), key=key) for name, key in _INDEX_KEYS.items()
+        }
+
+    def _index_add(self, task: Task) -> None:
+        for name, key in _INDEX_KEYS.items():
+            insort(self._indexes[name], task, key=key)
+
+    def _index_remove(self, task: Task) -> None:
+        for name, key in _INDEX_KEYS.items():
+            index = self._indexes[name]
+            del index[bisect_left(index, key(task), key=key)]
     
     def add(self, task:Task):
         """
@@ -53,9 +87,35 @@ class InMemoryTaskRepository:
         """
         if task.task_id not in self._data:
             self._data[task.task_id] = task
+            self._index_add(task)
             return
         raise TaskAlreadyExistsError(task.task_id)
     
+    def add_many(self, tasks: Sequence[Task]) -> None:
+        """
+            Dodaje paczkę zadań — wszystko albo nic.
+
+            - Najpierw sprawdza kolizje (z istniejącymi i wewnątrz paczki), potem zapisuje.
+            - Indeksy: dopisanie na koniec + jeden sort (Timsort scala dwa posortowane
+            przebiegi ~liniowo) zamiast `insort` per element.
+
+            :param tasks: Zadania do zapisania.
+            :raises TaskAlreadyExistsError: Przy pierwszym kolidującym `task_id`.
+            :return: None
+        """
+        data = self._data
+        seen: set[TaskId] = set()
+        for task in tasks:
+            if task.task_id in data or task.task_id in seen:
+                raise TaskAlreadyExistsError(task.task_id)
+            seen.add(task.task_id)
+        for task in tasks:
+            data[task.task_id] = task
+        for name, key in _INDEX_KEYS.items():
+            index = self._indexes[name]
+            index.extend(tasks)
+            index.sort(key=key)
+
     def get(self, task_id:TaskId) -> Optional[Task]:
         """
             Zwraca zadanie o podanym identyfikatorze `task_id`.
@@ -68,9 +128,7 @@ class InMemoryTaskRepository:
             :param task_id: Identyfikator zadania do pobrania.
             :return: Obiekt `Task`, jeśli istnieje, w przeciwnym razie `None`.
         """
-        if task_id in self._data:
-            return self._data[task_id]
-        return None
+        return self._data.get(task_id)  # jedno wyszukiwanie w słowniku zamiast dwóch
 
     def update(self, task: Task) -> None:
         """
@@ -86,11 +144,48 @@ class InMemoryTaskRepository:
             :return: None
         """
 
-        if task.task_id in self._data:
+        old = self._data.get(task.task_id)
+        if old is not None:
             self._data[task.task_id] = task
+            self._index_remove(old)
+            self._index_add(task)
             return None
         raise TaskNotFoundError(task.task_id)
     
+    def transition_status(self, task_id: TaskId, new_status: TaskStatus) -> Optional[Task]:
+        """
+            Zmienia status zadania; zwraca zadanie po zmianie albo None, gdy nie istnieje.
+
+            :param task_id: Identyfikator zadania.
+            :param new_status: Docelowy status.
+            :return: `Task` po zmianie (lub bez zmian, jeśli już miał ten status) albo None.
+        """
+        old = self._data.get(task_id)
+        if old is None or old.status is new_status:  # członkowie Enum są singletonami
+            return old
+        task = replace(old, status=new_status)  # kopia z jedną zmienioną kolumną
+        self._data[task_id] = task
+        self._index_remove(old)
+        self._index_add(task)
+        return task
+
+    def set_status(self, task_id: TaskId, new_status: TaskStatus) -> bool:
+        """
+            Ustawia status zadania; zwraca True przy faktycznej zmianie, False gdy bez zmian.
+
+            :raises TaskNotFoundError: Gdy zadanie nie istnieje.
+        """
+        old = self._data.get(task_id)
+        if old is None:
+            raise TaskNotFoundError(task_id)
+        if old.status is new_status:
+            return False
+        task = replace(old, status=new_status)
+        self._data[task_id] = task
+        self._index_remove(old)
+        self._index_add(task)
+        return True
+
     def remove(self, task_id: TaskId) -> None:
         """
             Usuwa zadanie o wskazanym identyfikatorze z repozytorium.
@@ -104,10 +199,11 @@ class InMemoryTaskRepository:
             :return: None
         """
 
-        if task_id in self._data:
-            del self._data[task_id]
-            return None
-        raise TaskNotFoundError(task_id)
+        task = self._data.pop(task_id, None)
+        if task is None:
+            raise TaskNotFoundError(task_id)
+        self._index_remove(task)
+        return None
     
     def list_all(
         self,
@@ -115,11 +211,12 @@ class InMemoryTaskRepository:
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         order_by: Optional[Literal["created_at", "title"]] = None,
-    ) -> list[Task]:
+    ) -> Iterator[Task]:
         """
-        Zwraca posortowaną i paginowaną listę zadań.
+        Zwraca posortowane i paginowane zadania (iterator).
 
-        - Sortowanie rosnące (ASC) po `order_by` (domyślnie "created_at").
+        - Sortowanie rosnące (ASC) po `order_by` (domyślnie "created_at")
+          — z gotowego indeksu wtórnego, bez sortowania przy odczycie.
         - Stabilność: tiebreaker po `task_id` ASC.
         - Paginacja: po sortowaniu (offset, limit).
         - Waliduje parametry wejściowe (order_by, offset, limit).
@@ -128,7 +225,7 @@ class InMemoryTaskRepository:
         :param offset: Liczba elementów do pominięcia po sortowaniu.
         :param order_by: Pole sortowania ("created_at" lub "title").
         :raises TaskValidationError: Przy błędnych parametrach.
-        :return: Lista obiektów `Task` po sortowaniu i paginacji.
+        :return: Iterator obiektów `Task` po sortowaniu i paginacji.
         """
         # domyślne wartości
         order_by = order_by or "created_at"
@@ -140,19 +237,43 @@ class InMemoryTaskRepository:
         if offset < 0 or (limit is not None and limit <= 0):
             raise TaskValidationError("pagination", "Offset >= 0, limit > 0")
 
-        # lista zadań
-        tasks = list(self._data.values())
+        # indeks wtórny jest już posortowany wg (order_by, task_id) → samo cięcie
+        index = self._indexes[order_by]
+        end = None if limit is None else offset + limit
+        return iter(index[offset:end])  # kopia strony: O(limit), odporna na późniejsze zmiany
+
+    def list_all_with_total(
+        self,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        order_by: Optional[Literal["created_at", "title"]] = None,
+    ) -> tuple[list[Task], int]:
+        """
+        Strona (jak `list_all`) + liczba wszystkich zadań; w pamięci to dwie tanie operacje.
 
-        # sortowanie z tiebreakerem
-        tasks.sort(key=lambda t: (getattr(t, order_by), t.task_id))
+        :return: (strona, count_all()).
+        """
+        return list(self.list_all(limit=limit, offset=offset, order_by=order_by)), self.count_all()
 
-        # paginacja po sortowaniu
-        if limit is not None:
-            tasks = tasks[offset : offset + limit]
-        else:
-            tasks = tasks[offset:]
+    def list_after(self, cursor: Optional[Cursor], limit: int) -> tuple[list[Task], Optional[Cursor]]:
+        """
+        Zwraca stronę za kursorem (keyset) — bisect w indeksie (created_at, task_id).
 
-        return tasks
+        :param cursor: Ostatni element poprzedniej strony (None = od początku).
+        :param limit: Rozmiar strony (>= 1).
+        :return: (strona, kursor następnej strony albo None, gdy to koniec).
+        :raises TaskValidationError: Gdy `limit` < 1.
+        """
+        if limit < 1:
+            raise TaskValidationError("pagination", "limit > 0")
+        index = self._indexes["created_at"]
+        start = 0 if cursor is None else bisect_right(
+            index, (cursor.created_at, cursor.task_id), key=_INDEX_KEYS["created_at"]
+        )
+        page = index[start:start + limit + 1]  # +1 → wiemy, czy jest następna strona
+        items = page[:limit]
+        return items, (Cursor.after(items[-1]) if len(page) > limit else None)
 
     def count_all(self) -> int:
         """
@@ -176,8 +297,12 @@ class InMemoryTaskRepository:
             :param task_id: Identyfikator zadania do sprawdzenia.
             :return: True, jeśli zadanie istnieje; False w przeciwnym razie.
         """
-        #return task_id in self._data  - mozna to zapisac krocej
+        return task_id in self._data
 
-        if task_id in self._data:
-            return True
-        return False
\ No newline at end of file
+    def flush(self) -> None:
+        """
+            Brak buforowania — dane są w pamięci, nie ma czego utrwalać (no-op).
+
+            :return: None
+        """
+        return None
@@ -1,14 +1,63 @@
 from __future__ import annotations
-from typing import Iterable
+from typing import Iterable, Iterator
 import sqlalchemy as db, select
 from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from pathlib import Path
 from notes.ports.task_repository import TaskRepository
-from notes.domain.task import Task, TaskId
+from notes.domain.task import Cursor, Task, TaskId
 from notes.domain.enums import TaskStatus
 from datetime import datetime, timezone
-from notes.domain.errors import TaskAlreadyExistsError, TaskNotFoundError, DomainError
+from notes.domain.errors import TaskAlreadyExistsError, TaskNotFoundError, TaskValidationError, DomainError
+from sqlalchemy.pool import StaticPool
+
+# WAL: czytelnicy nie blokują zapisu; NORMAL: fsync tylko przy checkpoincie (bezpieczne w WAL).
+# Uwaga: WAL nie działa poprawnie na sieciowych systemach plików.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# ile wierszy list_all pobiera z kursora naraz
+_YIELD_PER = 256
+
+# status w bazie jako mała liczba (porównania int zamiast napisów, węższe wiersze);
+# domena dalej używa TaskStatus — konwersja tylko na granicy adaptera
+_STATUS_CODES: dict[TaskStatus, int] = {
+    TaskStatus.OPEN: 0,
+    TaskStatus.IN_PROGRESS: 1,
+    TaskStatus.CLOSED: 2,
+}
+_STATUS_BY_CODE: dict[int, TaskStatus] = {code: status for status, code in _STATUS_CODES.items()}
+
+# rozmiar LRU przygotowanych instrukcji w sqlite3 (domyślnie 128)
+_SQLITE_CACHED_STATEMENTS = 256
+
+# liczniki per status utrzymywane przy zapisie (w tej samej transakcji, co zmiana wiersza)
+# → count_all czyta kilka wierszy task_stats zamiast skanować tasks
+_STATS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_ins AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_stats(status, cnt) VALUES (NEW.status, 1)
+            ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_del AFTER DELETE ON tasks BEGIN
+        UPDATE task_stats SET cnt = cnt - 1 WHERE status = OLD.status;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_upd AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status BEGIN
+        UPDATE task_stats SET cnt = cnt - 1 WHERE status = OLD.status;
+        INSERT INTO task_stats(status, cnt) VALUES (NEW.status, 1)
+            ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+    END""",
+)
+
+def _set_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cursor = dbapi_conn.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 class SqlTaskRepository(TaskRepository):
     def __init__(self, url: str | Path) -> None:
@@ -21,7 +70,17 @@ class SqlTaskRepository(TaskRepository):
         else:
             db_url = url
 
-        self.engine = db.create_engine('sqlite:///data/users.db', future=True)
+        if db_url.startswith("sqlite"):
+            # jedno długo żyjące połączenie zamiast otwierania pliku przy każdym wywołaniu
+            self.engine = db.create_engine(
+                db_url,
+                future=True,
+                connect_args={"check_same_thread": False, "cached_statements": _SQLITE_CACHED_STATEMENTS},
+                poolclass=StaticPool,
+            )
+            db.event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        else:
+            self.engine = db.create_engine(db_url, future=True)
         self.meta = db.MetaData()
         
         # database name
@@ -32,15 +91,117 @@ class SqlTaskRepository(TaskRepository):
             db.Column("title", db.String, nullable=False),
             db.Column("description", db.String, nullable=True),
             db.Column("created_at", db.String, nullable=False),  # ISO8601 '...Z'
-            db.Column("status", db.String, nullable=False),      # 'Open'/'In Progress'/'Closed'
+            db.Column("status", db.Integer, nullable=False),     # 0=Open, 1=In Progress, 2=Closed
+        )
+        self.task_stats = db.Table(
+            "task_stats",
+            self.meta,
+            db.Column("status", db.Integer, primary_key=True),
+            db.Column("cnt", db.Integer, nullable=False),
+        )
+        # indeks pod domyślne sortowanie list_all (created_at ASC, task_id ASC)
+        self.ix_created_id = db.Index("ix_tasks_created_id", self.tasks.c.created_at, self.tasks.c.task_id)
+        # ... i pod sortowanie po tytule (title ASC, task_id ASC) — bez sortowania w pamięci (temp B-tree)
+        self.ix_title_id = db.Index("ix_tasks_title_id", self.tasks.c.title, self.tasks.c.task_id)
+
+        # utwórz tabelę i indeks jeśli nie istnieją (bazę ze statusem TEXT najpierw migrujemy)
+        self._has_stats = db_url.startswith("sqlite")
+        with self.engine.begin() as conn:
+            legacy = self._has_stats and self._detach_text_status_table(conn)
+            self.meta.create_all(conn)
+            self.ix_created_id.create(conn, checkfirst=True)
+            self.ix_title_id.create(conn, checkfirst=True)
+            if legacy:
+                self._copy_text_status_rows(conn)
+        if self._has_stats:
+            self._install_stats()
+        self._prepare_statements()
+
+    def _prepare_statements(self) -> None:
+        """Buduje raz instrukcje używane przez metody wołane z serwisu.
+
+        Parametry idą przez `bindparam`, więc tekst SQL jest zawsze ten sam: SQLAlchemy
+        bierze skompilowaną postać z cache, a sqlite3 — przygotowaną instrukcję ze swojego LRU."""
+        t = self.tasks
+        by_id = t.c.task_id == db.bindparam("b_task_id")
+        self._q_insert = db.insert(t)
+        self._q_get = db.select(t).where(by_id)
+        # SET z kluczy parametrów (title, description, created_at, status)
+        self._q_update = db.update(t).where(by_id)
+        self._q_transition = db.update(t).where(by_id).values(status=db.bindparam("b_status"))
+        self._q_transition_returning = (
+            self._q_transition.returning(*t.c) if self.engine.dialect.update_returning else None
+        )
+        # strzeżony UPDATE: przy tym samym statusie 0 wierszy, bez zapisu strony
+        self._q_set_status = self._q_transition.where(t.c.status != db.bindparam("b_status"))
+        self._q_remove = db.delete(t).where(by_id)
+        self._q_exists = db.select(db.literal(1)).select_from(t).where(by_id).limit(1)
+        if self._has_stats:
+            # suma kilku liczników (po jednym na status) — O(1) względem liczby zadań
+            self._q_count = db.select(db.func.coalesce(db.func.sum(self.task_stats.c.cnt), 0))
+        else:
+            self._q_count = db.select(db.func.count()).select_from(t)
+        # total jako kolumna strony: przy task_stats podzapytanie O(1), inaczej okno
+        # COUNT(*) OVER () (liczone po całym wyniku, ale w tym samym przebiegu co strona)
+        if self._has_stats:
+            total = db.select(db.func.coalesce(db.func.sum(self.task_stats.c.cnt), 0)).scalar_subquery()
+        else:
+            total = db.func.count().over()
+        self._q_total = total.label("total")
+        self._q_order = {
+            "created_at": db.select(t).order_by(t.c.created_at.asc(), t.c.task_id.asc()),
+            "title": db.select(t).order_by(t.c.title.asc(), t.c.task_id.asc()),
+        }
+
+    def _detach_text_status_table(self, conn) -> bool:
+        """Jeśli `tasks` ma jeszcze status TEXT ('Open'/…), odsuwa ją jako `tasks_v1`.
+
+        Indeksy, triggery i task_stats starej wersji są usuwane — create_all założy
+        nowe, a `_install_stats` przeliczy liczniki. Zwraca True, gdy trzeba skopiować wiersze."""
+        columns = {row[1]: str(row[2]).upper() for row in conn.exec_driver_sql("PRAGMA table_info(tasks)")}
+        if not columns or columns.get("status") == "INTEGER":
+            return False
+        for trigger in ("trg_tasks_stats_ins", "trg_tasks_stats_del", "trg_tasks_stats_upd"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+        for index in ("ix_tasks_created_id", "ix_tasks_title_id"):
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+        conn.exec_driver_sql("DROP TABLE IF EXISTS task_stats")
+        conn.exec_driver_sql("ALTER TABLE tasks RENAME TO tasks_v1")
+        return True
+
+    def _copy_text_status_rows(self, conn) -> None:
+        """Jednorazowa migracja: przepisuje wiersze z `tasks_v1` z mapowaniem status → kod."""
+        cases = " ".join(f"WHEN '{status.value}' THEN {code}" for status, code in _STATUS_CODES.items())
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (task_id, title, description, created_at, status) "
+            f"SELECT task_id, title, description, created_at, CASE status {cases} ELSE 0 END FROM tasks_v1"
         )
+        conn.exec_driver_sql("DROP TABLE tasks_v1")
 
-        # utwórz tabelę jeśli nie istnieje
-        self.meta.create_all(self.engine)
+    def _install_stats(self) -> None:
+        """Zakłada triggery task_stats; przy pierwszym założeniu przelicza liczniki z istniejących wierszy."""
+        t, st = self.tasks, self.task_stats
+        probe = db.text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_tasks_stats_ins'")
+        with self.engine.begin() as conn:
+            if conn.execute(probe).first() is not None:
+                return
+            conn.execute(db.delete(st))
+            conn.execute(db.insert(st).from_select(
+                ["status", "cnt"],
+                db.select(t.c.status, db.func.count()).group_by(t.c.status),
+            ))
+            for ddl in _STATS_TRIGGERS:
+                conn.execute(db.text(ddl))
     
     def _encode_dt(self,dt: datetime) -> str:
-        # ISO 8601 w UTC z sufiksem 'Z'
-        return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+        # ISO 8601 w UTC z sufiksem 'Z'; zawsze 6 cyfr mikrosekund, żeby sortowanie tekstowe
+        # w SQL zgadzało się z chronologią ('...:05Z' > '...:05.000001Z' leksykograficznie)
+        if dt.tzinfo is not timezone.utc:
+            dt = dt.astimezone(timezone.utc)
+        return (
+            f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+            f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond:06d}Z"
+        )
 
     def _decode_dt(self,s: str) -> datetime:
         # '...Z' -> aware UTC
@@ -52,15 +213,11 @@ class SqlTaskRepository(TaskRepository):
             'title':task.title,
             'description':task.description,
             'created_at':self._encode_dt(task.created_at),
-            'status':task.status.value if isinstance(task.status, TaskStatus) else str(task.status),
+            'status':_STATUS_CODES.get(task.status, 0),  # TaskStatus (str Enum) → kod int
         }
     
     def _from_row(self, row: db.Row | dict) -> Task:
-        raw_status = row["status"]
-        try:
-            status = raw_status if isinstance(raw_status, TaskStatus) else TaskStatus(raw_status)
-        except ValueError:
-            status = TaskStatus.OPEN
+        status = _STATUS_BY_CODE.get(row["status"], TaskStatus.OPEN)  # kod int → enum, defensywny fallback
 
         return Task(
             task_id=TaskId(row["task_id"]),
@@ -72,19 +229,43 @@ class SqlTaskRepository(TaskRepository):
     
     def add(self, task: Task) -> None:
         rec = self._to_row(task)
-        stmt = db.insert(self.tasks).values(**rec)
         try:
             with self.engine.begin() as conn:
-                conn.execute(stmt)
+                conn.execute(self._q_insert, rec)
         except IntegrityError:
             # konflikt PK
             raise TaskAlreadyExistsError(task.task_id)
     
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """Dodaje wiele zadań w jednej transakcji (executemany).
+
+        Rzuca TaskAlreadyExistsError z pierwszym kolidującym `task_id`;
+        wtedy cała paczka jest wycofywana.
+        """
+        rows = [self._to_row(t) for t in tasks]
+        if not rows:
+            return
+        ids = [r["task_id"] for r in rows]
+        taken = db.select(self.tasks.c.task_id).where(self.tasks.c.task_id.in_(ids))
+        try:
+            with self.engine.begin() as conn:
+                existing = conn.execute(taken).scalars().first()
+                if existing is not None:
+                    raise TaskAlreadyExistsError(existing)
+                conn.execute(self._q_insert, rows)
+        except IntegrityError as e:
+            # duplikat w obrębie samej paczki
+            seen: set[str] = set()
+            for task_id in ids:
+                if task_id in seen:
+                    raise TaskAlreadyExistsError(task_id)
+                seen.add(task_id)
+            raise DomainError(str(e))
+
     def get(self, task_id: TaskId) -> Task:
-        stmt = db.select(self.tasks).where(self.tasks.c.task_id == str(task_id))
         try:
             with self.engine.connect() as conn:
-                row = conn.execute(stmt).mappings().first()
+                row = conn.execute(self._q_get, {"b_task_id": str(task_id)}).mappings().first()
                 if row is None:
                     raise TaskNotFoundError(task_id)
                 return self._from_row(row)
@@ -93,47 +274,73 @@ class SqlTaskRepository(TaskRepository):
 
     def update(self, task: Task) -> None:
         rec = self._to_row(task)
-        stmt = (
-            db.update(self.tasks)
-            .where(self.tasks.c.task_id == str(task.task_id))
-            .values(**rec)
-        )
+        rec["b_task_id"] = rec.pop("task_id")  # klucz w WHERE, reszta → SET
         try:
             with self.engine.begin() as conn:
-                result = conn.execute(stmt)
+                result = conn.execute(self._q_update, rec)
                 if result.rowcount == 0:
                     raise TaskNotFoundError(task.task_id)
         except OSError as e:
             raise DomainError(str(e))
 
+    def transition_status(self, task_id: TaskId, new_status: TaskStatus) -> Task | None:
+        """Zmiana statusu jednym `UPDATE … RETURNING` (jeden round-trip, bez TOCTOU).
+        Brak wiersza → None. Ten sam status też przechodzi przez UPDATE (trigger task_stats
+        reaguje tylko na faktyczną zmianę), więc wynik jest idempotentny."""
+        params = {"b_task_id": str(task_id), "b_status": _STATUS_CODES[new_status]}
+        try:
+            if self._q_transition_returning is None:
+                # backend bez RETURNING → dwa kroki w jednej transakcji
+                with self.engine.begin() as conn:
+                    if conn.execute(self._q_transition, params).rowcount == 0:
+                        return None
+                    row = conn.execute(self._q_get, params).mappings().one()
+                    return self._from_row(row)
+            with self.engine.begin() as conn:
+                row = conn.execute(self._q_transition_returning, params).mappings().first()
+                return None if row is None else self._from_row(row)
+        except OSError as e:
+            raise DomainError(str(e))
+
+    def set_status(self, task_id: TaskId, new_status: TaskStatus) -> bool:
+        """Strzeżony `UPDATE … WHERE task_id = ? AND status <> ?` — jeden zapis, zero odczytów.
+        rowcount 1 → True; 0 → sonda EXISTS rozstrzyga „już ma ten status” (False)
+        od „brak rekordu” (TaskNotFoundError)."""
+        params = {"b_task_id": str(task_id), "b_status": _STATUS_CODES[new_status]}
+        try:
+            with self.engine.begin() as conn:
+                if conn.execute(self._q_set_status, params).rowcount == 1:
+                    return True
+                if conn.execute(self._q_exists, params).first() is None:
+                    raise TaskNotFoundError(task_id)
+                return False
+        except OSError as e:
+            raise DomainError(str(e))
+
     def remove(self, task_id: TaskId) -> None:
-        stmt = db.delete(self.tasks).where(self.tasks.c.task_id == str(task_id))
         try:
             with self.engine.begin() as conn:
-                result = conn.execute(stmt)
+                result = conn.execute(self._q_remove, {"b_task_id": str(task_id)})
                 if result.rowcount == 0:
                     raise TaskNotFoundError(task_id)
         except OSError as e:
             raise DomainError(str(e))
 
+    def flush(self) -> None:
+        # każda operacja commituje własną transakcję — nie ma czego dopisywać
+        return None
+
     def exists(self, task_id: TaskId) -> bool:
-        stmt = (
-            db.select(db.literal(1))
-            .select_from(self.tasks)
-            .where(self.tasks.c.task_id == str(task_id))
-            .limit(1)
-        )
         try:
             with self.engine.connect() as conn:
-                return conn.execute(stmt).first() is not None
+                return conn.execute(self._q_exists, {"b_task_id": str(task_id)}).first() is not None
         except OSError as e:
             raise DomainError(str(e))
 
     def count_all(self) -> int:
-        stmt = db.select(db.func.count()).select_from(self.tasks)
         try:
             with self.engine.connect() as conn:
-                return int(conn.execute(stmt).scalar_one())
+                return int(conn.execute(self._q_count).scalar_one())
         except OSError as e:
             raise DomainError(str(e))
 
@@ -142,25 +349,70 @@ class SqlTaskRepository(TaskRepository):
         limit: int | None = None,
         offset: int = 0,
         order_by: str | None = None,
-    ) -> Iterable[Task]:
+    ) -> Iterator[Task]:
+        """Strumieniuje wiersze (yield_per) zamiast materializować całą stronę.
+        Połączenie zamyka się po wyczerpaniu lub porzuceniu generatora."""
         # sortowanie stabilne: ASC + tie-breaker po task_id
         order = (order_by or "created_at").lower()
-        if order == "title":
-            ordering = (self.tasks.c.title.asc(), self.tasks.c.task_id.asc())
-        else:
-            ordering = (self.tasks.c.created_at.asc(), self.tasks.c.task_id.asc())
-
-        stmt = db.select(self.tasks).order_by(*ordering)
+        stmt = self._q_order["title" if order == "title" else "created_at"]
         if offset and offset > 0:
             stmt = stmt.offset(int(offset))
         if limit is not None:
             if limit <= 0:
-                return []
+                return iter(())
             stmt = stmt.limit(int(limit))
 
+        return self._stream(stmt)
+
+    def list_all_with_total(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        order_by: str | None = None,
+    ) -> tuple[list[Task], int]:
+        """Strona + total w jednym SELECT (kolumna `total` przy każdym wierszu).
+        Pusta strona (offset za końcem) nie niesie totalu → wtedy osobny, tani count_all."""
+        if limit is not None and limit <= 0:
+            return [], self.count_all()
+        order = (order_by or "created_at").lower()
+        stmt = self._q_order["title" if order == "title" else "created_at"].add_columns(self._q_total)
+        if offset and offset > 0:
+            stmt = stmt.offset(int(offset))
+        if limit is not None:
+            stmt = stmt.limit(int(limit))
         try:
             with self.engine.connect() as conn:
                 rows = conn.execute(stmt).mappings().all()
-                return [self._from_row(r) for r in rows]
+        except OSError as e:
+            raise DomainError(str(e))
+        if not rows:
+            return [], self.count_all()
+        return [self._from_row(row) for row in rows], int(rows[0]["total"])
+
+    def list_after(self, cursor: Cursor | None, limit: int) -> tuple[list[Task], Cursor | None]:
+        """Paginacja keyset: WHERE (created_at, task_id) > (?, ?) zamiast OFFSET.
+        Korzysta z indeksu ix_tasks_created_id; pobiera limit + 1, żeby wiedzieć, czy jest dalej.
+        Rzuca TaskValidationError, gdy limit < 1."""
+        if limit < 1:
+            raise TaskValidationError("pagination", "limit > 0")
+        t = self.tasks
+        stmt = self._q_order["created_at"].limit(int(limit) + 1)
+        if cursor is not None:
+            stmt = stmt.where(
+                db.tuple_(t.c.created_at, t.c.task_id)
+                > db.tuple_(self._encode_dt(cursor.created_at), str(cursor.task_id))
+            )
+        page = list(self._stream(stmt))
+        items = page[:limit]
+        return items, (Cursor.after(items[-1]) if len(page) > limit else None)
+
+    def _stream(self, stmt) -> Iterator[Task]:
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(
+                    stmt.execution_options(stream_results=True, yield_per=_YIELD_PER)
+                ).mappings()
+                for row in result:
+                    yield self._from_row(row)
         except OSError as e:
             raise DomainError(str(e))
\ No newline at end of file
@@ -1,9 +1,13 @@
 from notes.ports.clock import Clock
-from datetime import datetime, UTC, timezone
+from datetime import datetime, timezone
+
+# wiązane raz przy imporcie — now() to jedno wywołanie w C
+_UTC = timezone.utc
+_now = datetime.now
 
 class SystemClock(Clock):
     """Adapter systemowy korzystający z bieżącego czasu UTC."""
     
     def now(self) -> datetime:
         """Zwraca aktualny czas w strefie UTC (aware)."""
-        return datetime.now(timezone.utc)
\ No newline at end of file
+        return _now(_UTC)
\ No newline at end of file
@@ -1,7 +1,30 @@
 from notes.ports.id_provider import IdProvider
-import uuid
+import os
 
 class UuidIdProvider(IdProvider):
 
     def new_id(self):
-        return str(uuid.uuid4())
\ No newline at end of file
+        """Zwraca UUID4 jako 32 znaki hex (bez myślników), bez tworzenia obiektu `uuid.UUID`.
+
+        Krótszy klucz = węższe wiersze i strony indeksów; stare ID z myślnikami pozostają
+        poprawne (porównanie to zwykła równość napisów), a pierwsze 8 znaków bez zmian."""
+        b = bytearray(os.urandom(16))
+        b[6] = (b[6] & 0x0F) | 0x40  # wersja 4
+        b[8] = (b[8] & 0x3F) | 0x80  # wariant RFC 4122
+        return b.hex()
+
+    def new_ids(self, n):
+        """Zwraca `n` UUID4 (32 znaki hex) rosnących w kolejności paczki.
+
+        Pierwsze 4 bajty to licznik od losowego startu (big-endian), reszta jest wspólna
+        i losowa — ID rosną w kolejności wejścia (monotoniczny tiebreaker przy wspólnym
+        `created_at`), a skrócone ID (8 znaków) w paczce się nie powtarzają. Bity wersji
+        i wariantu leżą we wspólnej części; losowych bitów zostaje ~90 + start licznika."""
+        if n > 0x100000000:
+            raise ValueError("Paczka ID nie może przekroczyć 2**32 elementów")
+        b = bytearray(os.urandom(16))
+        b[6] = (b[6] & 0x0F) | 0x40  # wersja 4
+        b[8] = (b[8] & 0x3F) | 0x80  # wariant RFC 4122
+        start = int.from_bytes(b[:4], "big") % (0x100000000 - n + 1)  # start + n - 1 mieści się w 4 bajtach
+        tail = b[4:].hex()
+        return [f"{start + i:08x}{tail}" for i in range(n)]
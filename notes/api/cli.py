@@ -1,20 +1,21 @@
 from notes.domain.errors import TaskNotFoundError, TaskValidationError, DomainError
-from notes.domain.task import Task, TaskId
+from notes.domain.task import Cursor, Task, TaskId
 from notes.services.task_service import TaskService
-from notes.adapters.memory.task_repo import InMemoryTaskRepository
-from notes.adapters.jsonl.task_repo import JsonlTaskRepository
-from typer import Option, Typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from typing import Literal, Optional
+from typer import Exit, Option, Typer
+from typing import Callable, Literal, Optional, TYPE_CHECKING
 from math import ceil
+import sys
 from pathlib import Path
-from notes.domain.enums import TaskStatus
-from notes.api.colors import TaskColor
+from datetime import datetime
+from functools import lru_cache, partial, wraps
+from notes.domain.enums import TaskStatus, OPEN_STR, IN_PROGRESS_STR, CLOSED_STR
+from notes.api.colors import RED, BLUE, GREEN, RESET
 from notes.adapters.system.id_provider_uuid import UuidIdProvider
 from notes.adapters.system.clock_system import SystemClock
-from notes.adapters.sql.task_repo import SqlTaskRepository
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.panel import Panel
 
 
 ### COMMENTS
@@ -29,25 +30,45 @@ from notes.adapters.sql.task_repo import SqlTaskRepository
 # Zasady:
 # - Zero logiki biznesowej — deleguj do TaskService.
 # - Jednorazowy bootstrap zależności (repo + service) na starcie modułu.
+# - Ciężkie importy (Rich, SQLAlchemy, adaptery) są leniwe — ładowane dopiero,
+#   gdy komenda ich potrzebuje (szybszy start, np. `notes --help`).
+# - Bez TTY (pipe/CI) wszystkie komendy piszą zwykły tekst — Rich nie jest ładowany:
+#   sukces → `OK <id>` / wiersze TSV na stdout, błąd → `ERR <komunikat>` na stderr + kod 1.
 # - Stabilne listowanie gwarantuje repo (sort ASC + tiebreaker + paginacja).
 
 
 app = Typer(help="Notes/Tasks CLI")
-console = Console()
+
+# stdout przekierowany (pipe/plik/CI) → zwykły tekst bez Rich (bez markup i ANSI)
+_RICH = sys.stdout.isatty()
+
+@lru_cache(maxsize=1)
+def get_console() -> "Console":
+    """Zwraca (tworzoną przy pierwszym użyciu) konsolę Rich."""
+    from rich.console import Console
+    return Console()
 
 service: TaskService | None = None  # ustawimy w callbacku
 
+@lru_cache(maxsize=4)
 def build_service(file: Optional[Path] = None, db: Optional[Path] = None) -> TaskService:
     # Priorytet: SQL > JSONL > InMemory
     """Tworzy serwis na bazie wybranego adaptera.
     - Brak pliku -> InMemory
     - Podany plik -> Jsonl (trwałość)
+
+    Wynik zapamiętany per (file, db): kolejne wywołania callbacku w tym samym procesie
+    (testy, REPL) nie budują repo od nowa — cache/indeksy zostają ciepłe.
     """
+    # importy adapterów dopiero tutaj — SQLAlchemy ładuje się tylko z --db
     if db:
+        from notes.adapters.sql.task_repo import SqlTaskRepository
         repo = SqlTaskRepository(db)
     elif file:
+        from notes.adapters.jsonl.task_repo import JsonlTaskRepository
         repo = JsonlTaskRepository(file)
     else:
+        from notes.adapters.memory.task_repo import InMemoryTaskRepository
         repo = InMemoryTaskRepository()
 
     id_provider = UuidIdProvider()
@@ -56,7 +77,10 @@ def build_service(file: Optional[Path] = None, db: Optional[Path] = None) -> Tas
 
 def get_service() -> TaskService:
     if service is None:
-        console.print("[red]Błąd: serwis nie został zainicjalizowany[/]")
+        if _RICH:
+            get_console().print("[red]Błąd: serwis nie został zainicjalizowany[/]")
+        else:
+            _plain_err("serwis nie został zainicjalizowany")
         raise SystemExit(1)
     return service
 
@@ -67,26 +91,149 @@ def main(
 ) -> None:
     global service
     service = build_service(file=file, db=db)
+    service.clear_cache()  # granica żądania — serwis z lru_cache nie przenosi stanu między komendami
 
 def short_id(task_id: TaskId | str, n: int = 8) -> str:
     """Zwraca skróconą wersję UUID do wyświetlenia (np. pierwsze 8 znaków)."""
     return task_id[:n]
     
 
+# status -> gotowy znacznik Rich; liczone raz przy imporcie
+_STATUS_STR: dict[TaskStatus, str] = {
+    TaskStatus.OPEN: f"{RED}{OPEN_STR}{RESET}",
+    TaskStatus.IN_PROGRESS: f"{BLUE}{IN_PROGRESS_STR}{RESET}",
+    TaskStatus.CLOSED: f"{GREEN}{CLOSED_STR}{RESET}",
+}
+
 def color_status(status: TaskStatus) -> str:
-    """ """
-    match status:
-        case TaskStatus.OPEN:
-            return f"{TaskColor.RED}{status.value}{TaskColor.RESET}"
-        case TaskStatus.IN_PROGRESS:
-            return f"{TaskColor.BLUE}{status.value}{TaskColor.RESET}"
-        case TaskStatus.CLOSED:
-            return f"{TaskColor.GREEN}{status.value}{TaskColor.RESET}"
-        case _:
-            return str(status)
-
-def render_list(items: list[Task], total: int, page: int, page_size: int) -> None:
-    """Renderuje tabelę Rich z kolumnami: ID, Title, Created, Status + stopką paginacji."""
+    """Zwraca status pokolorowany znacznikami Rich (lookup w gotowym słowniku)."""
+    return _STATUS_STR.get(status, str(status))
+
+_CREATED_FMT = "%Y-%m-%d %H:%M"
+
+@lru_cache(maxsize=4096)
+def _fmt_created(created_at: datetime) -> str:
+    """Formatuje created_at do tabeli; wynik zapamiętany (strftime jest kosztowny)."""
+    return created_at.strftime(_CREATED_FMT)
+
+@lru_cache(maxsize=32)
+def _panel(title: str | None, border: str) -> Callable[..., "Panel"]:
+    """Zwraca fabrykę `Panel.fit` z ustalonym tytułem i ramką (jedna na parę title/border)."""
+    from rich.panel import Panel
+    return partial(Panel.fit, title=title, border_style=border)
+
+def _plain_ok(task_id: TaskId | str) -> None:
+    """Potwierdzenie bez TTY: `OK <id>` na stdout."""
+    sys.stdout.write(f"OK {task_id}\n")
+
+def _plain_err(msg: object) -> None:
+    """Błąd bez TTY: `ERR <komunikat>` na stderr (stdout zostaje czysty dla potoku)."""
+    sys.stderr.write(f"ERR {msg}\n")
+
+def _notice(text: str, border: str | None) -> None:
+    """Komunikat demo: panel Rich w TTY (`border=None` → sam tekst), zwykła linia bez TTY."""
+    if not _RICH:
+        sys.stdout.write(f"{text}\n")
+    elif border is None:
+        get_console().print(text)
+    else:
+        get_console().print(_panel(None, border)(text))
+
+_NOT_FOUND_TMPL = (
+    "❌ {err}\n"
+    "[dim]Nie znaleziono zadania o ID: {tid}[/]\n"
+    "[dim]Użyj 'notes list', żeby znaleźć poprawne ID[/]"
+)
+_DOMAIN_ERROR_TMPL = "❌ {err}"
+
+def _print_not_found(err: TaskNotFoundError, tid: str) -> None:
+    """Drukuje wspólny panel „Nie znaleziono” (done/inprogress/rm/show)."""
+    if not _RICH:
+        _plain_err(err)
+        return
+    get_console().print(_panel("Nie znaleziono", "red")(_NOT_FOUND_TMPL.format(err=err, tid=tid)))
+
+def _print_domain_error(err: DomainError) -> None:
+    """Drukuje wspólny panel „Błąd domenowy”."""
+    if not _RICH:
+        _plain_err(err)
+        return
+    get_console().print(_panel("Błąd domenowy", "red")(_DOMAIN_ERROR_TMPL.format(err=err)))
+
+def _print_validation_error(err: TaskValidationError, hint: str = "") -> None:
+    """Drukuje wspólny panel „Błąd walidacji” (z opcjonalną podpowiedzią; bez TTY pomijaną)."""
+    if not _RICH:
+        _plain_err(err)
+        return
+    get_console().print(_panel("Błąd walidacji", "red")(f"❌ {err}{hint}"))
+
+def handle_domain_errors(fn: Callable[..., None] | None = None, *, hint: str = ""):
+    """
+    Dekorator komend: jeden zestaw handlerów błędów domenowych zamiast try/except w każdej komendzie.
+
+    - TaskValidationError → „Błąd walidacji” (+ `hint`),
+    - TaskNotFoundError → „Nie znaleziono” (ID z argumentu `task_id`),
+    - DomainError → „Błąd domenowy”.
+
+    Bez TTY: `ERR <komunikat>` na stderr i kod wyjścia 1, żeby skrypt mógł zareagować.
+    """
+    def decorate(fn: Callable[..., None]) -> Callable[..., None]:
+        @wraps(fn)  # Typer czyta sygnaturę przez __wrapped__
+        def wrapper(*args, **kwargs) -> None:
+            try:
+                return fn(*args, **kwargs)
+            except TaskValidationError as e:
+                _print_validation_error(e, hint)
+            except TaskNotFoundError as e:
+                _print_not_found(e, kwargs.get("task_id", args[0] if args else ""))
+            except DomainError as e:
+                _print_domain_error(e)
+            if not _RICH:
+                raise Exit(1)
+        return wrapper
+    return decorate(fn) if fn is not None else decorate
+
+def _plain_row(t: Task) -> str:
+    """Wiersz dla wyjścia bez TTY: pola rozdzielone tabulatorem."""
+    return f"{t.task_id}\t{t.title}\t{t.description or ''}\t{_fmt_created(t.created_at)}\t{t.status.value}\n"
+
+def _cursor_token(cursor: Cursor) -> str:
+    """Kursor jako token dla `--after`: '<created_at ISO>,<task_id>'."""
+    return f"{cursor.created_at.isoformat()},{cursor.task_id}"
+
+def _parse_cursor(token: str) -> Cursor:
+    """Odwrotność `_cursor_token`; błędny token → TaskValidationError."""
+    created, sep, task_id = token.partition(",")
+    try:
+        created_at = datetime.fromisoformat(created)
+    except ValueError:
+        created_at = None
+    if not sep or not task_id or created_at is None or created_at.tzinfo is None:
+        raise TaskValidationError("after", "Oczekiwano '<created_at ISO>,<task_id>'")
+    return Cursor(created_at=created_at, task_id=TaskId(task_id))
+
+def render_list(
+    items: list[Task],
+    total: int | None,
+    page: int,
+    page_size: int,
+    next_cursor: Cursor | None = None,
+) -> None:
+    """Renderuje tabelę Rich z kolumnami: ID, Title, Created, Status + stopką paginacji.
+
+    `total=None` → tryb keyset: stopka pokazuje token `--after` następnej strony zamiast liczby stron.
+
+    Bez TTY: wiersze rozdzielane tabulatorem (id, title, description, created, status), bez stopki;
+    token następnej strony (jeśli jest) trafia na stderr jako `NEXT <token>`, żeby skrypt mógł iść dalej.
+    """
+    if not _RICH:
+        sys.stdout.write("".join([_plain_row(t) for t in items]))
+        if next_cursor is not None:
+            sys.stderr.write(f"NEXT {_cursor_token(next_cursor)}\n")
+        return
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
 
     table = Table(show_lines=True, header_style="bold")
     table.add_column("ID", no_wrap=True, style="cyan")
@@ -96,26 +243,37 @@ def render_list(items: list[Task], total: int, page: int, page_size: int) -> Non
     table.add_column("Created At", no_wrap=True, style="dim")
     table.add_column("Status", no_wrap=True)
 
-    for t in items:
-        created = t.created_at.strftime("%Y-%m-%d %H:%M")
-        table.add_row(
+    # wiersze przygotowane jednym przebiegiem (short_id/color_status wpisane inline)
+    status_str = _STATUS_STR
+    rows = [
+        (
             t.task_id,
-            short_id(t.task_id),
+            t.task_id[:8],
             t.title,
             t.description,
-            created,
-            color_status(t.status),
+            _fmt_created(t.created_at),
+            status_str.get(t.status) or str(t.status),
         )
+        for t in items
+    ]
+    for row in rows:
+        table.add_row(*row)
     
-    ##pages = max(1, ceil(total/ page_size)) if page_size > 0 else 1
-    pages = max(1, ceil(total / max(1, page_size)))
+    if total is None:
+        nxt = f"Dalej: --after {_cursor_token(next_cursor)}" if next_cursor else "Koniec listy"
+        footer_markup = f"[dim]Page size: {page_size} • {nxt}[/dim]"
+    else:
+        ##pages = max(1, ceil(total/ page_size)) if page_size > 0 else 1
+        pages = max(1, ceil(total / max(1, page_size)))
+        nxt = f" • Dalej: --after {_cursor_token(next_cursor)}" if next_cursor else ""
+        footer_markup = f"[dim]Strona {page}/{pages} • Razem: {total} • Page size: {page_size}{nxt}[/dim]"
 
-    console.print(table)
-    console.print(
-        f"[dim]Strona {page}/{pages} • Razem: {total} • Page size: {page_size}[/dim]"
-    )
+    # tabela + stopka w jednym przebiegu renderowania Rich
+    footer = Text.from_markup(footer_markup, overflow="fold")
+    get_console().print(Group(table, footer))
 
 @app.command("add")
+@handle_domain_errors(hint="\n[dim]Podpowiedź: użyj np.:[/] notes add 'Tytuł' -d 'Opis'")
 def add(title: str, desc: str | None = Option(None, "--desc", "-d")) -> None:
     """
     Dodaje nowe zadanie.
@@ -125,68 +283,56 @@ def add(title: str, desc: str | None = Option(None, "--desc", "-d")) -> None:
     - Sukces: Panel „✅ Dodano zadanie”, pokaż skrócone ID.
     - Błąd walidacji: TaskValidationError → czerwony Panel z podpowiedzią.
     """
-    try:
-        svc = get_service()
-        task = svc.create_task(title=title, description=desc)
-        console.print(Panel.fit(
-            f"✅ Dodano zadanie\n"
-            f"[cyan]ID:[/cyan] {short_id(task.task_id)}\n"
-            f"[dim]Title:[/dim] {task.title}"
-            + (f"\n[dim]Description:[/dim] {task.description}" if task.description else ""),
-            title="Sukces",
-            border_style="green",
-        ))
-
-
-
-    except TaskValidationError as e:
-        console.print(Panel.fit(
-        f"❌ {e}\n[dim]Podpowiedź: użyj np.:[/] notes add 'Tytuł' -d 'Opis'",
-        title="Błąd walidacji",
-        border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
-    return 
+    svc = get_service()
+    task = svc.create_task(title=title, description=desc)
+    if not _RICH:
+        _plain_ok(task.task_id)
+        svc.flush()
+        return
+    get_console().print(_panel("Sukces", "green")(
+        f"✅ Dodano zadanie\n"
+        f"[cyan]ID:[/cyan] {short_id(task.task_id)}\n"
+        f"[dim]Title:[/dim] {task.title}"
+        + (f"\n[dim]Description:[/dim] {task.description}" if task.description else ""),
+    ))
+    svc.flush()
 
 
 @app.command("list")
+@handle_domain_errors(hint="\n[dim]Zla Paginacja")
 def list_cmd(
     page: int = Option(1, "--page", "-p", min=1),
     page_size: int = Option(20, "--page-size", "-s", min=1),
     order_by: Literal["created_at", "title"] | None = Option(None, "--order-by", "-o"),
+    after: str | None = Option(None, "--after", "-a", help="Token kursora ze stopki poprzedniej strony (paginacja keyset)"),
 ) -> None:
     """
     Listuje zadania z paginacją.
 
     Flow:
-    - items, total = service.list_tasks(page=page, page_size=page_size, order_by=order_by)
-    - render_list(items, total, page, page_size)
+    - --after: items, next = service.list_tasks_after(cursor, page_size) — bez OFFSET i COUNT
+      (kursor to created_at + task_id, więc nie łączy się z --order-by title ani --page)
+    - inaczej: items, total = service.list_tasks(page=page, page_size=page_size, order_by=order_by);
+      strona 1 to offset 0 (start keyset + total), jej stopka podaje token --after dla dalszych stron
+    - render_list(...)
     - Błąd paginacji: TaskValidationError → czerwony Panel.
     """
-    try:
-        svc = get_service()
-        items, total = svc.list_tasks(page=page, page_size=page_size, order_by=order_by)
-        render_list(items, total, page, page_size)
-        console.print(f"[dim]Strona {page}, razem {total} zadań[/]")
-    except TaskValidationError as e:
-        console.print(Panel.fit(
-        f"❌ {e}\n[dim]Zla Paginacja",
-        title="Błąd walidacji",
-        border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
+    svc = get_service()
+    if after is not None:
+        if (order_by or "created_at") != "created_at":
+            raise TaskValidationError("after", "--after działa tylko z kolejnością created_at")
+        if page != 1:
+            raise TaskValidationError("after", "--after zastępuje --page — podaj tylko jedno")
+        items, next_cursor = svc.list_tasks_after(_parse_cursor(after), page_size=page_size)
+        render_list(items, None, page, page_size, next_cursor=next_cursor)
+        return
+    items, total = svc.list_tasks(page=page, page_size=page_size, order_by=order_by)
+    # token do przejścia na keyset (tylko kolejność domyślna — kursor to created_at + task_id)
+    has_next = items and page * page_size < total and (order_by or "created_at") == "created_at"
+    render_list(items, total, page, page_size, next_cursor=Cursor.after(items[-1]) if has_next else None)
 
 @app.command("inprogress")
+@handle_domain_errors
 def in_progress(task_id: str) -> None:
     """
     Oznacza zadanie jako w toku (status="In Progress").
@@ -196,28 +342,19 @@ def in_progress(task_id: str) -> None:
     - Sukces: Panel „✅ W toku”, pokaż ID i tytuł.
     - Błąd: TaskNotFoundError → „❌ Nie znaleziono… Użyj 'notes list'”.
     """
-    try:
-        svc = get_service()
-        task = svc.mark_in_progress(TaskId(task_id))
-        console.print(Panel.fit(
-            f"✅ Sukces! ID: {short_id(task.task_id)}\n[dim]Title:[/dim] {task.title}\nStatus: {color_status(task.status)}",
-            title="Sukces",
-            border_style="green",
-        ))
-    except TaskNotFoundError as e:
-        console.print(Panel.fit(
-            f"❌ {e}\n[dim]Nie znaleziono zadania o ID: {task_id}[/]\n, [dim]Użyj 'notes list', żeby znaleźć poprawne ID[/]",
-            title="Nie znaleziono",
-            border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
+    svc = get_service()
+    task = svc.mark_in_progress(TaskId(task_id))
+    if not _RICH:
+        _plain_ok(task.task_id)
+        svc.flush()
+        return
+    get_console().print(_panel("Sukces", "green")(
+        f"✅ Sukces! ID: {short_id(task.task_id)}\n[dim]Title:[/dim] {task.title}\nStatus: {color_status(task.status)}",
+    ))
+    svc.flush()
 
 @app.command("done")
+@handle_domain_errors
 def done(task_id: str) -> None:
     """
     Oznacza zadanie jako zakończone (status="Closed").
@@ -227,28 +364,19 @@ def done(task_id: str) -> None:
     - Sukces: Panel „✅ Zamknięto”, pokaż ID i tytuł.
     - Błąd: TaskNotFoundError → „❌ Nie znaleziono… Użyj 'notes list'”.
     """
-    try:
-        svc = get_service()
-        task = svc.mark_done(TaskId(task_id))
-        console.print(Panel.fit(
-            f"✅ Sukces! ID: {short_id(task.task_id)}\n[dim]Title:[/dim] {task.title}\nStatus: {color_status(task.status)}",
-            title="Sukces",
-            border_style="green",
-        ))
-    except TaskNotFoundError as e:
-        console.print(Panel.fit(
-            f"❌ {e}\n[dim]Nie znaleziono zadania o ID: {task_id}[/]\n [dim]Użyj 'notes list', żeby znaleźć poprawne ID[/]",
-            title="Nie znaleziono",
-            border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
+    svc = get_service()
+    task = svc.mark_done(TaskId(task_id))
+    if not _RICH:
+        _plain_ok(task.task_id)
+        svc.flush()
+        return
+    get_console().print(_panel("Sukces", "green")(
+        f"✅ Sukces! ID: {short_id(task.task_id)}\n[dim]Title:[/dim] {task.title}\nStatus: {color_status(task.status)}",
+    ))
+    svc.flush()
 
 @app.command("rm")
+@handle_domain_errors
 def rm(task_id: str) -> None:
     """
     Usuwa zadanie.
@@ -258,31 +386,20 @@ def rm(task_id: str) -> None:
     - Sukces: Panel „🟡 Usunięto”.
     - Błąd: TaskNotFoundError → czerwony Panel z podpowiedzią.
     """
-    try:
-        svc = get_service()
-        svc.remove_task(TaskId(task_id))
-        console.print(Panel.fit(
-            f"🟡 Zadanie usunięte\nID: {short_id(task_id)}\n[dim] skasowany[/]",
-            title="Usunięto",
-            border_style="yellow",
-        ))
-    except TaskNotFoundError as e:
-        console.print(Panel.fit(
-            f"❌ {e}\n"
-            f"[dim]Nie znaleziono zadania o ID: {task_id}[/]\n"
-            f"[dim]Użyj 'notes list', żeby znaleźć poprawne ID[/]",
-            title="Nie znaleziono",
-            border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
+    svc = get_service()
+    svc.remove_task(TaskId(task_id))
+    if not _RICH:
+        _plain_ok(task_id)
+        svc.flush()
+        return
+    get_console().print(_panel("Usunięto", "yellow")(
+        f"🟡 Zadanie usunięte\nID: {short_id(task_id)}\n[dim] skasowany[/]",
+    ))
+    svc.flush()
 
 
 @app.command("show")
+@handle_domain_errors
 def show(task_id: str) -> None:
     """
     Pokazuje szczegóły pojedynczego zadania.
@@ -292,36 +409,22 @@ def show(task_id: str) -> None:
     - Panel z polami: ID, Title, Description (jeśli jest), Created (UTC), Status (kolor)
     - Błąd: TaskNotFoundError → czerwony Panel.
     """
-    try:
-        svc = get_service()
-        task = svc.get_task(TaskId(task_id))
-
-        id_line = f"ID: {short_id(task.task_id)}"
-        title_line = f"Title: {task.title}"
-        desc_text = task.description or "[dim]brak[/]"
-        desc_line = f"Description: {desc_text}"
-        created_line = f"Created: {task.created_at.isoformat()}"
-        status_line = f"Status: {color_status(task.status)}"
-
-        console.print(Panel.fit(
-            "\n".join([id_line, title_line, desc_line, created_line, status_line]),
-            title="Szczegóły zadania",
-            border_style="cyan",
-        ))
-    except TaskNotFoundError as e:
-        console.print(Panel.fit(
-            f"❌ {e}\n"
-            f"[dim]Nie znaleziono zadania o ID: {task_id}[/]\n"
-            f"[dim]Użyj 'notes list', żeby znaleźć poprawne ID[/]",
-            title="Nie znaleziono",
-            border_style="red",
-        ))
-    except DomainError as e:
-        console.print(Panel.fit(
-            f"❌ {e}",
-            title="Błąd domenowy",
-            border_style="red",
-        ))
+    svc = get_service()
+    task = svc.get_task(TaskId(task_id))
+    if not _RICH:
+        sys.stdout.write(_plain_row(task))
+        return
+
+    id_line = f"ID: {short_id(task.task_id)}"
+    title_line = f"Title: {task.title}"
+    desc_text = task.description or "[dim]brak[/]"
+    desc_line = f"Description: {desc_text}"
+    created_line = f"Created: {task.created_at.isoformat()}"
+    status_line = f"Status: {color_status(task.status)}"
+
+    get_console().print(_panel("Szczegóły zadania", "cyan")(
+        "\n".join([id_line, title_line, desc_line, created_line, status_line]),
+    ))
 
 @app.command("demo")
 def demo() -> None:
@@ -335,41 +438,44 @@ def demo() -> None:
     - Pokazuje listę po zmianach.
     """
 
-    console.print(Panel.fit("🚀 Start demonstracji", border_style="cyan"))
+    _notice("🚀 Start demonstracji", "cyan")
 
     # 1️⃣ Tworzymy 3 zadania
     svc = get_service()
-    t1 = svc.create_task("Buy milk", description="2% lactose-free")
-    t2 = svc.create_task("Call mom", description="Sunday afternoon")
-    t3 = svc.create_task("Read a book", description="DDD chapter 3")
-    t4 = svc.create_task("Watch Movie", description="Furioza 2")
+    t1, t2, t3, t4 = svc.create_tasks_bulk([
+        ("Buy milk", "2% lactose-free"),
+        ("Call mom", "Sunday afternoon"),
+        ("Read a book", "DDD chapter 3"),
+        ("Watch Movie", "Furioza 2"),
+    ])
     
     items, total = svc.list_tasks()
-    console.print(Panel.fit(f"✅ Utworzono {total} zadania", border_style="green"))
+    _notice(f"✅ Utworzono {total} zadania", "green")
 
     # 2️⃣ Pokazujemy listę po dodaniu
     #items, total = service.list_tasks()
-    console.print("\n📋 Lista po utworzeniu:")
+    _notice("\n📋 Lista po utworzeniu:", None)
     render_list(items, total, page=1, page_size=20)
 
     # 3️⃣ Oznaczamy jedno jako zakończone
     svc.mark_done(t2.task_id)
-    console.print(Panel.fit(f"✔️ Zamknięto zadanie: {short_id(t2.task_id)} ({t2.title})", border_style="yellow"))
+    _notice(f"✔️ Zamknięto zadanie: {short_id(t2.task_id)} ({t2.title})", "yellow")
 
     # 3️⃣ Oznaczamy jedno jako in progress
     svc.mark_in_progress(t4.task_id)
-    console.print(Panel.fit(f"✔️ Zmieniono status: {short_id(t4.task_id)} ({t4.title})", border_style="blue"))
+    _notice(f"✔️ Zmieniono status: {short_id(t4.task_id)} ({t4.title})", "blue")
 
     # 4️⃣ Usuwamy jedno zadanie
     svc.remove_task(t3.task_id)
-    console.print(Panel.fit(f"🗑️ Usunięto zadanie: {short_id(t3.task_id)} ({t3.title})", border_style="red"))
+    _notice(f"🗑️ Usunięto zadanie: {short_id(t3.task_id)} ({t3.title})", "red")
 
     # 5️⃣ Pokazujemy listę po zmianach
     items, total = svc.list_tasks()
-    console.print("\n📋 Lista po zmianach:")
+    _notice("\n📋 Lista po zmianach:", None)
     render_list(items, total, page=1, page_size=20)
 
-    console.print(Panel.fit("🏁 Demo zakończone", border_style="cyan"))
+    svc.flush()
+    _notice("🏁 Demo zakończone", "cyan")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,7 @@
-from enum import Enum
+from typing import Final
 
-class TaskColor(Enum):
-    RED = "[red]"
-    BLUE = "[blue]"
-    GREEN = "[green]"
-    RESET = "[/]"
-
-    def __str__(self):
-        return self.value
\ No newline at end of file
+# znaczniki Rich jako zwykłe stałe str — bez narzutu Enum przy każdym wierszu
+RED: Final = "[red]"
+BLUE: Final = "[blue]"
+GREEN: Final = "[green]"
+RESET: Final = "[/]"
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Final
 
 class TaskStatus(str, Enum):
     OPEN = "Open"
@@ -6,4 +7,9 @@ class TaskStatus(str, Enum):
     CLOSED = "Closed"
 
     def __str__(self):
-        return self.value
\ No newline at end of file
+        return self.value
+
+# wartości statusów jako zwykłe str (porównania bez odwołań do atrybutów Enum)
+OPEN_STR: Final = TaskStatus.OPEN.value
+IN_PROGRESS_STR: Final = TaskStatus.IN_PROGRESS.value
+CLOSED_STR: Final = TaskStatus.CLOSED.value
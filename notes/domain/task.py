@@ -1,11 +1,11 @@
 from typing import NewType, Literal
-import datetime
+from datetime import datetime
 from dataclasses import dataclass
 from notes.domain.enums import TaskStatus
 
 TaskId = NewType("TaskId", str)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Task():
     """
     Model domenowy pojedynczego zadania; niemutowalny; status z zamkniętego zestawu wartości; 
@@ -18,6 +18,21 @@ class Task():
     status: TaskStatus = TaskStatus.OPEN
 
 
+@dataclass(frozen=True, slots=True)
+class Cursor():
+    """
+    Pozycja w liście posortowanej po (created_at, task_id) — do paginacji keyset
+    (kolejna strona zaczyna się ZA tym kluczem, bez OFFSET i bez COUNT)
+    """
+    created_at: datetime
+    task_id: TaskId
+
+    @classmethod
+    def after(cls, task: Task) -> "Cursor":
+        """Kursor wskazujący na `task` (następna strona zacznie się za nim)."""
+        return cls(created_at=task.created_at, task_id=task.task_id)
+
+
 ### COMMENTS
 #Ten plik definiuje model domenowy `Task` — czyli czysty, niezmienny obiekt opisujący pojedyncze zadanie.
 #Nie zawiera logiki biznesowej ani technicznej — tylko dane i ich strukturalne znaczenie.
@@ -118,4 +133,12 @@ class Task():
 # Czas powinien być przekazany z zewnątrz — np. przez serwis przy tworzeniu Taska.
 # Na Level 2 nauczymy się wstrzykiwać go przez osobny port Clock.
 #
-# Na razie zakładamy, że serwis przekazuje `datetime.datetime.utcnow()`.
\ No newline at end of file
+# Na razie zakładamy, że serwis przekazuje `datetime.datetime.utcnow()`.
+
+# ======================================
+# 8️⃣ slots=True
+# ======================================
+# slots=True generuje `__slots__` zamiast `__dict__` dla każdej instancji.
+# - mniej pamięci na obiekt (brak słownika atrybutów),
+# - szybszy odczyt pól (t.title, t.status) — ważne przy serializacji wielu zadań.
+# Nie można dodawać nowych atrybutów w locie — ale frozen=True i tak tego zabrania.
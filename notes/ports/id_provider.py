@@ -3,4 +3,11 @@ from typing import Protocol
 class IdProvider(Protocol):
     """Port odpowiedzialny za generowanie unikalnych identyfikatorów."""
     def new_id(self) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    def new_ids(self, n: int) -> list[str]:
+        """Zwraca `n` unikalnych ID rosnących leksykograficznie w kolejności zwrotu.
+
+        Paczka z `create_tasks_bulk` ma jeden wspólny `created_at`, więc o kolejności
+        w obrębie paczki decyduje tiebreaker `task_id` — te ID muszą go zachować."""
+        return [self.new_id() for _ in range(n)]
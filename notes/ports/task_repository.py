@@ -1,5 +1,6 @@
-from typing import Protocol, Optional, Literal
-from notes.domain.task import Task, TaskId
+from typing import Protocol, Optional, Literal, Iterable, Sequence
+from notes.domain.task import Cursor, Task, TaskId
+from notes.domain.enums import TaskStatus
 
 
 ### COMMENTS
@@ -37,6 +38,20 @@ class TaskRepository(Protocol):
             Operacja powinna być atomowa (spójność po błędzie częściowym).
         """
 
+    def add_many(self, tasks: Sequence[Task]) -> None:
+        """Dodaje paczkę rekordów `Task` jedną operacją (jedna transakcja / jeden zapis).
+
+        Zwraca:
+            None
+
+        Wyjątki domenowe:
+            TaskAlreadyExistsError: Gdy którykolwiek `task_id` już istnieje
+            (także powtórzony w samej paczce) — wtedy nic nie zostaje zapisane.
+
+        Uwagi:
+            Wszystko albo nic; koszt commitu/fsync rozkłada się na całą paczkę.
+        """
+
     def get(self, task_id: TaskId) -> Optional[Task]:
         """Zwraca zadanie o podanym `task_id`.
 
@@ -63,6 +78,31 @@ class TaskRepository(Protocol):
             Repozytorium nie „skleja” pól — zapisuje kompletny obiekt.
         """
 
+    def transition_status(self, task_id: TaskId, new_status: TaskStatus) -> Optional[Task]:
+        """Ustawia status zadania jedną operacją (bez osobnego get + update).
+
+        Zwraca:
+            Optional[Task]: Zadanie po zmianie; `None`, gdy rekord z `task_id` nie istnieje.
+            Jeśli zadanie już ma `new_status`, zwraca je bez zmian (idempotencja).
+
+        Uwagi:
+            Adapter SQL robi to jednym `UPDATE … RETURNING` — brak okna między odczytem a zapisem.
+        """
+
+    def set_status(self, task_id: TaskId, new_status: TaskStatus) -> bool:
+        """Ustawia status bez zwracania rekordu (gdy wołający zna już resztę pól).
+
+        Zwraca:
+            bool: True, gdy status się zmienił; False, gdy zadanie już miało `new_status`.
+
+        Wyjątki domenowe:
+            TaskNotFoundError: Gdy rekord z `task_id` nie istnieje.
+
+        Uwagi:
+            Adapter SQL wykonuje strzeżony `UPDATE … WHERE status <> ?` i czyta rowcount;
+            sondę EXISTS robi tylko przy 0 wierszy (brak zmiany albo brak rekordu).
+        """
+
     def remove(self, task_id: TaskId) -> None:
         """Usuwa (hard delete) rekord o podanym `task_id`.
 
@@ -82,8 +122,8 @@ class TaskRepository(Protocol):
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         order_by: Optional[Literal["created_at", "title"]] = None,
-    ) -> list[Task]:
-        """Zwraca posortowaną listę zadań z paginacją.
+    ) -> Iterable[Task]:
+        """Zwraca posortowane zadania z paginacją (leniwie — iterator/generator).
 
         Parametry:
             limit (Optional[int]): Maksymalna liczba wyników na stronie.
@@ -102,7 +142,8 @@ class TaskRepository(Protocol):
             - ZAWSZE po sortowaniu: najpierw sort → potem offset/limit.
 
         Zwraca:
-            list[Task]: Fragment listy po zastosowaniu sortowania i paginacji.
+            Iterable[Task]: Fragment po zastosowaniu sortowania i paginacji.
+                            Wywołujący, który potrzebuje listy, robi `list(...)`.
 
         Wyjątki domenowe:
             Brak — metoda odczytu nie rzuca wyjątków domenowych.
@@ -112,6 +153,46 @@ class TaskRepository(Protocol):
             Walidacje wejścia zwykle realizuje serwis; repo zakłada poprawne typy.
         """
 
+    def list_all_with_total(
+        self,
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        order_by: Optional[Literal["created_at", "title"]] = None,
+    ) -> tuple[list[Task], int]:
+        """Jak `list_all`, ale razem z liczbą wszystkich rekordów — jednym zapytaniem.
+
+        Zwraca:
+            tuple[list[Task], int]: (strona po sortowaniu i paginacji, `count_all()`).
+
+        Uwagi:
+            Adapter SQL dokłada total jako kolumnę tej samej instrukcji SELECT,
+            więc paginowana lista z totalem to jeden round-trip zamiast dwóch.
+        """
+
+    def list_after(
+        self,
+        cursor: Optional[Cursor],
+        limit: int,
+    ) -> tuple[list[Task], Optional[Cursor]]:
+        """Zwraca stronę zadań ZA kursorem (paginacja keyset, kolejność created_at, task_id ASC).
+
+        Parametry:
+            cursor (Optional[Cursor]): Ostatni element poprzedniej strony; `None` = od początku.
+            limit (int): Maksymalna liczba wyników (>= 1).
+
+        Zwraca:
+            tuple[list[Task], Optional[Cursor]]: Strona oraz kursor do następnej strony;
+            `None`, gdy za tą stroną nie ma już zadań (wywołujący może przestać pytać).
+
+        Wyjątki domenowe:
+            TaskValidationError: Gdy `limit` < 1.
+
+        Uwagi:
+            Adapter szuka pozycji po kluczu (indeks / `WHERE (created_at, task_id) > (?, ?)`),
+            więc koszt strony nie rośnie z jej numerem i nie jest potrzebny `count_all`.
+        """
+
     def count_all(self) -> int:
         """Zwraca liczbę wszystkich rekordów (do paginacji).
 
@@ -129,3 +210,13 @@ class TaskRepository(Protocol):
             Adapter może używać najtańszego mechanizmu (np. `SELECT 1` w DB).
         """
 
+    def flush(self) -> None:
+        """Utrwala zapisy zbuforowane przez adapter (granica „commitu”).
+
+        Zwraca:
+            None
+
+        Uwagi:
+            Adaptery bez buforowania (pamięć, SQL z transakcją na operację)
+            implementują to jako no-op.
+        """
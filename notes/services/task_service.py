@@ -1,7 +1,10 @@
 from notes.ports.task_repository import TaskRepository
-from notes.domain.task import Task, TaskId
+from notes.domain.task import Cursor, Task, TaskId
 from notes.domain.errors import TaskValidationError, TaskNotFoundError
-from typing import Literal
+from typing import Iterable, Literal
+from dataclasses import replace
+import time
+import re
 from notes.domain.enums import TaskStatus
 from notes.ports.id_provider import IdProvider
 from notes.ports.clock import Clock
@@ -22,6 +25,16 @@ from notes.ports.clock import Clock
 #     * Brak wpisu przy „twardym” pobraniu/aktualizacji → `TaskNotFoundError`.
 # - Paginacja: serwis liczy `offset/limit`, repo odpowiada za sort + tiebreaker + cięcie.
 # - Modele domenowe są niemutowalne (`frozen=True`) — zmiana = nowa instancja i `repo.update`.
+# - `count_all` przy listowaniu jest zapamiętywany na krótko (TTL), ale tylko dla dużych
+#   zbiorów — małe liczymy zawsze na świeżo; create/remove unieważniają cache.
+# - Mapa tożsamości (`_identity_map`): zadania widziane w jednostce pracy nie są ponownie
+#   pobierane z repo; `clear_cache()` wyznacza granicę jednostki pracy.
+# - Domyślna pierwsza strona listy jest zapamiętywana i unieważniana przy każdej mutacji.
+
+_NON_WS = re.compile(r"\S").search  # pierwszy znak niebiały; bez kopii jak przy .strip()
+_COUNT_TTL = 5.0  # s — jak długo `list_tasks` ufa zapamiętanej liczbie rekordów
+_COUNT_CACHE_MIN = 1000  # poniżej tej liczby COUNT jest tani, nie cache'ujemy
+_FIRST_PAGE_SIZE = 20  # domyślny page_size — pierwsza strona ma własną, zapamiętaną ścieżkę
 
 
 
@@ -35,6 +48,10 @@ class TaskService:
         self.repo = repo
         self.id_provider = id_provider
         self.clock = clock
+        self._count_cache: tuple[float, int] | None = None  # (time.monotonic(), total)
+        # domyślna pierwsza strona (najczęstsze `notes list`): (time.monotonic(), items, total)
+        self._first_page: tuple[float, list[Task], int] | None = None
+        self._identity_map: dict[TaskId, Task] = {}  # zadania znane w bieżącej jednostce pracy
     
     def create_task(self, title, description=None, due_date=None) -> Task:
         """
@@ -52,27 +69,73 @@ class TaskService:
             :raises TaskValidationError: Gdy `title` jest niepoprawny.
         """
 
-        if not title or not title.strip():
+        if not title or _NON_WS(title) is None:
             raise TaskValidationError("title", "Tytul nie moze byc pusty")
         
         task_id = self.id_provider.new_id()
         created_at = self.clock.now()
         task = Task(task_id = TaskId(task_id), title=title, description=description, created_at=created_at)
         self.repo.add(task)
+        self._count_cache = None
+        self._first_page = None
+        self._identity_map[task.task_id] = task
         
         return task
+
+    def create_tasks_bulk(self, specs: Iterable[tuple[str, str | None]]) -> list[Task]:
+        """
+            Tworzy wiele zadań naraz (np. demo, import) z jednym odczytem zegara.
+
+            - Walidacja jak w `create_task` — najpierw dla wszystkich tytułów, potem
+            jeden `repo.add_many` (SQL: executemany w jednej transakcji).
+            - `created_at` = jeden wspólny `Clock.now()` dla całej paczki (bez sztucznych
+            przesunięć); ID z `IdProvider.new_ids` rosną w kolejności `specs`, więc
+            tiebreaker `task_id` zachowuje kolejność wejścia także na liście.
+
+            :param specs: Pary (title, description).
+            :return: Utworzone zadania w kolejności wejścia.
+            :raises TaskValidationError: Gdy któryś `title` jest niepoprawny (nic nie zapisano).
+        """
+        specs = list(specs)
+        for title, _ in specs:
+            if not title or _NON_WS(title) is None:
+                raise TaskValidationError("title", "Tytul nie moze byc pusty")
+
+        now = self.clock.now()
+        ids = self.id_provider.new_ids(len(specs))
+        tasks = [
+            Task(task_id=TaskId(task_id), title=title, description=description, created_at=now)
+            for task_id, (title, description) in zip(ids, specs)
+        ]
+        self.repo.add_many(tasks)  # jedna transakcja / jeden zapis na całą paczkę
+        self._identity_map.update((task.task_id, task) for task in tasks)
+        self._count_cache = None
+        self._first_page = None
+        return tasks
+
+    def create_tasks(self, items: Iterable[dict]) -> list[Task]:
+        """
+            Wariant `create_tasks_bulk` dla rekordów słownikowych (np. import JSON).
+
+            :param items: Słowniki z kluczem "title" i opcjonalnym "description".
+            :return: Utworzone zadania w kolejności wejścia.
+            :raises TaskValidationError: Gdy któryś `title` jest niepoprawny (nic nie zapisano).
+        """
+        # brak "title" → "" → TaskValidationError z walidacji w create_tasks_bulk
+        return self.create_tasks_bulk((item.get("title", ""), item.get("description")) for item in items)
     
     def list_tasks(
         self,
         page: int = 1,
-        page_size: int = 20,
+        page_size: int = _FIRST_PAGE_SIZE,
         order_by: Literal["created_at", "title"] | None = None,
         ) -> tuple[list[Task], int]:
         """
         Zwraca stronę zadań oraz łączną liczbę rekordów.
 
         - Oblicza paginację: offset = (page - 1) * page_size, limit = page_size.
-        - Wywołuje repozytorium: list_all(limit, offset, order_by).
+        - Wywołuje repozytorium: list_all_with_total(limit, offset, order_by) — strona i total
+          jednym zapytaniem; gdy total jest świeży w cache, wystarczy list_all.
         - Zwraca: (lista zadań, liczba wszystkich rekordów).
 
         :param page: Numer strony (>=1).
@@ -80,62 +143,117 @@ class TaskService:
         :raises TaskValidationError: Gdy paginacja jest niepoprawna.
         :return: (items, total)
         """
+        if page == 1 and page_size == _FIRST_PAGE_SIZE and (order_by is None or order_by == "created_at"):
+            return self._first_page_cached()
         if page < 1 or page_size < 1:
             raise TaskValidationError("pagination", "page >= 1, page_size >= 1")
 
-        order_by = order_by or "created_at"
         offset = (page - 1) * page_size
         limit = page_size
 
-        total = self.repo.count_all()
-        items = self.repo.list_all(limit=limit, offset=offset)
-
-        return items, total
+        # sort + tiebreaker + cięcie robi repo (SQL: ORDER BY … LIMIT/OFFSET po indeksie)
+        return self._page(limit, offset, order_by)
     
+    def _first_page_cached(self) -> tuple[list[Task], int]:
+        """Ścieżka specjalizowana list_tasks(page=1, domyślny rozmiar i sort) — bez arytmetyki
+        paginacji; wynik zapamiętany do pierwszej mutacji (lub TTL)."""
+        now = time.monotonic()
+        cached = self._first_page
+        if cached is None or now - cached[0] >= _COUNT_TTL:
+            items, total = self._page(_FIRST_PAGE_SIZE, 0, None)
+            cached = self._first_page = (now, items, total)
+        return list(cached[1]), cached[2]  # kopia — wywołujący może modyfikować listę
+
+    def list_tasks_after(
+        self,
+        cursor: Cursor | None = None,
+        page_size: int = 20,
+        ) -> tuple[list[Task], Cursor | None]:
+        """
+        Zwraca stronę zadań za kursorem (paginacja keyset, kolejność created_at + task_id).
+
+        - Bez OFFSET i bez `count_all` — koszt strony nie zależy od jej numeru.
+        - `list_tasks` zostaje dla kompatybilności (numer strony + total).
+
+        :param cursor: Kursor z poprzedniej strony (None = pierwsza strona).
+        :param page_size: Liczba elementów na stronę (>=1).
+        :raises TaskValidationError: Gdy page_size jest niepoprawny.
+        :return: (items, next_cursor) — next_cursor None oznacza koniec listy.
+        """
+        if page_size < 1:
+            raise TaskValidationError("pagination", "page_size >= 1")
+        return self.repo.list_after(cursor, page_size)
+
+    def _page(
+        self,
+        limit: int,
+        offset: int,
+        order_by: Literal["created_at", "title"] | None,
+        ) -> tuple[list[Task], int]:
+        """Strona + total: z zapamiętanym totalem (TTL, duże zbiory) — samo list_all;
+        inaczej jedno wywołanie list_all_with_total zamiast count_all + list_all."""
+        now = time.monotonic()
+        cached = self._count_cache
+        if cached is not None and now - cached[0] < _COUNT_TTL:
+            return list(self.repo.list_all(limit=limit, offset=offset, order_by=order_by)), cached[1]
+        items, total = self.repo.list_all_with_total(limit=limit, offset=offset, order_by=order_by)
+        self._count_cache = (now, total) if total >= _COUNT_CACHE_MIN else None
+        return list(items), total
+
     def mark_in_progress(self, task_id: TaskId) -> Task:
         """
             Marks an existing task as completed (`status="In Progress"`).
 
-            - Fetches the task using `repo.get(task_id)`.
-            - If not found, raises `TaskNotFoundError`.
-            - Creates a new `Task` with the same ID and data, but `status="In Progress"`.
-            - Persists the change via `repo.update(new_task)`.
+            - Task known from the identity map: `repo.set_status(task_id, IN_PROGRESS)`
+              (SQL: guarded `UPDATE … WHERE status <> ?`, no read); the result is
+              built locally with `replace(known, status=…)`.
+            - Otherwise a single `repo.transition_status(task_id, IN_PROGRESS)`
+              (SQL: one `UPDATE … RETURNING`, no separate fetch).
+            - If not found (`None`), raises `TaskNotFoundError`.
+            - Idempotent: a task already "In Progress" is returned unchanged.
 
             :param task_id: Identifier of the task to mark as done.
             :raises TaskNotFoundError: If no task with the given ID exists.
             :return: The updated `Task` instance with status `"In Progress"`.
         """
-        task = self.repo.get(task_id)
-        if task is None:
-            raise TaskNotFoundError(task_id)
-        if task.status == TaskStatus.IN_PROGRESS:
-            return task
-        closed_task = Task(task_id = task.task_id, title=task.title, description=task.description, created_at=task.created_at, status=TaskStatus.IN_PROGRESS)
-        self.repo.update(closed_task)
-        return closed_task
+        return self._set_status(task_id, TaskStatus.IN_PROGRESS)
 
     def mark_done(self, task_id: TaskId) -> Task:
         """
             Marks an existing task as completed (`status="Closed"`).
 
-            - Fetches the task using `repo.get(task_id)`.
-            - If not found, raises `TaskNotFoundError`.
-            - Creates a new `Task` with the same ID and data, but `status="Closed"`.
-            - Persists the change via `repo.update(new_task)`.
+            - Task known from the identity map: `repo.set_status(task_id, CLOSED)`
+              (SQL: guarded `UPDATE … WHERE status <> ?`, no read); the result is
+              built locally with `replace(known, status=…)`.
+            - Otherwise a single `repo.transition_status(task_id, CLOSED)`
+              (SQL: one `UPDATE … RETURNING`, no separate fetch).
+            - If not found (`None`), raises `TaskNotFoundError`.
+            - Idempotent: an already closed task is returned unchanged.
 
             :param task_id: Identifier of the task to mark as done.
             :raises TaskNotFoundError: If no task with the given ID exists.
             :return: The updated `Task` instance with status `"Closed"`.
         """
-        task = self.repo.get(task_id)
-        if task is None:
-            raise TaskNotFoundError(task_id)
-        if task.status == TaskStatus.CLOSED:
-            return task
-        closed_task = Task(task_id = task.task_id, title=task.title, description=task.description, created_at=task.created_at, status=TaskStatus.CLOSED)
-        self.repo.update(closed_task)
-        return closed_task
+        return self._set_status(task_id, TaskStatus.CLOSED)
     
+    def _set_status(self, task_id: TaskId, status: TaskStatus) -> Task:
+        known = self._identity_map.get(task_id)
+        if known is not None:
+            try:
+                self.repo.set_status(task_id, status)  # tylko zapis — pozostałe pola już znamy
+            except TaskNotFoundError:
+                self._identity_map.pop(task_id, None)  # usunięte poza tym serwisem
+                raise
+            task = known if known.status is status else replace(known, status=status)
+        else:
+            found = self.repo.transition_status(task_id, status)
+            if found is None:
+                raise TaskNotFoundError(task_id)
+            task = found
+        self._identity_map[task_id] = task
+        self._first_page = None  # zmiana statusu widoczna na liście
+        return task
+
     def remove_task(self, task_id: TaskId) -> None:
         """
             Usuwa zadanie z repozytorium.
@@ -147,20 +265,51 @@ class TaskService:
             :raises TaskNotFoundError: Gdy nie znaleziono zadania.
             :return: None
         """
+        self._identity_map.pop(task_id, None)
         self.repo.remove(task_id)
+        self._count_cache = None
+        self._first_page = None
     
     def get_task(self, task_id: TaskId) -> Task:
         """
             Zwraca pojedyncze zadanie o wskazanym identyfikatorze.
 
-            - Pobiera obiekt `Task` z repozytorium.
+            - Najpierw mapa tożsamości (zadania już widziane w tej jednostce pracy),
+              potem repozytorium; wynik trafia do mapy.
             - Jeśli nie istnieje, zgłasza `TaskNotFoundError`.
 
             :param task_id: Identyfikator zadania do pobrania.
             :raises TaskNotFoundError: Gdy nie znaleziono zadania.
             :return: Obiekt `Task`.
         """
+        task = self._identity_map.get(task_id)
+        if task is not None:
+            return task
         task = self.repo.get(task_id)
         if task is None:
             raise TaskNotFoundError(task_id)
-        return task
\ No newline at end of file
+        self._identity_map[task_id] = task
+        return task
+
+    def clear_cache(self) -> None:
+        """
+            Czyści pamięć podręczną serwisu (mapa tożsamości + zapamiętany count).
+
+            - Wywoływane na granicy żądania (np. start komendy CLI), żeby mapa nie rosła
+              bez końca i nie trzymała stanu sprzed zmian z zewnątrz.
+
+            :return: None
+        """
+        self._identity_map.clear()
+        self._count_cache = None
+        self._first_page = None
+
+    def flush(self) -> None:
+        """
+            Utrwala zapisy zbuforowane przez repozytorium (granica „commitu”).
+
+            - Deleguje do `repo.flush()`; dla adapterów bez bufora to no-op.
+
+            :return: None
+        """
+        self.repo.flush()
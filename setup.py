@@ -0,0 +1,43 @@
+"""Instalacja pakietu `notes` z opcjonalną kompilacją gorących modułów przez mypyc.
+
+    pip install mypy                     # dostarcza mypyc
+    python setup.py build_ext --inplace  # buduje rozszerzenia C obok plików .py
+
+Bez mypyc (albo z NOTES_NO_MYPYC=1), a także gdy mypyc odrzuci kod lub kompilacja C
+się nie uda, pakiet instaluje się jako czysty Python — kod źródłowy jest ten sam,
+rozszerzenia są tylko przyspieszeniem. Typy modułów z MYPYC_MODULES pilnuje
+tests/test_mypyc_types.py, żeby regresja nie przechodziła po cichu w fallback.
+"""
+import os
+import warnings
+from setuptools import setup, find_namespace_packages
+
+# moduły wywoływane w ciasnych pętlach (serwis + repozytorium pamięciowe)
+MYPYC_MODULES = [
+    "notes/services/task_service.py",
+    "notes/adapters/memory/task_repo.py",
+]
+
+ext_modules = []
+if os.environ.get("NOTES_NO_MYPYC") != "1":
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        pass  # brak mypyc → czysty Python
+    else:
+        # `notes/` nie ma __init__.py (namespace package) — nazwy modułów liczymy od katalogu głównego
+        try:
+            ext_modules = mypycify(["--explicit-package-bases", *MYPYC_MODULES])
+        except (Exception, SystemExit) as e:  # błąd typów w mypycify kończy się sys.exit
+            warnings.warn(f"mypyc: kompilacja pominięta ({e!r}) — instalacja jako czysty Python")
+            ext_modules = []
+        for ext in ext_modules:
+            ext.optional = True  # błąd kompilatora C → ostrzeżenie build_ext zamiast przerwania
+
+setup(
+    name="notes-cli",
+    version="0.1.0",
+    python_requires=">=3.11",
+    packages=find_namespace_packages(include=["notes", "notes.*"]),
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,49 @@
+from typer.testing import CliRunner
+from notes.api.cli import app
+
+runner = CliRunner()  # stdout to nie TTY → CLI pisze zwykły tekst
+
+
+def invoke(path, *args):
+    return runner.invoke(app, ["--file", str(path), *args])
+
+
+def test_list_pages_with_after_token_from_stderr(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    ids = [invoke(path, "add", f"T{i}").stdout.split()[1] for i in range(3)]
+
+    first = invoke(path, "list", "-s", "2")
+    assert [line.split("\t")[0] for line in first.stdout.splitlines()] == ids[:2]
+    token = first.stderr.split()[1]  # "NEXT <token>"
+
+    rest = invoke(path, "list", "-s", "2", "--after", token)
+    assert [line.split("\t")[0] for line in rest.stdout.splitlines()] == ids[2:]
+    assert "NEXT" not in rest.stderr
+
+
+def test_list_after_rejects_title_order_and_page(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    invoke(path, "add", "A")
+    token = "2025-01-01T00:00:00+00:00,x"
+
+    for extra in (["--order-by", "title"], ["--page", "2"]):
+        result = invoke(path, "list", "--after", token, *extra)
+        assert result.exit_code == 1
+        assert result.stderr.startswith("ERR ") and "after" in result.stderr
+        assert result.stdout == ""  # opcja nie jest po cichu pomijana
+
+
+def test_status_rm_and_errors_are_plain_text_without_tty(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    task_id = invoke(path, "add", "A").stdout.split()[1]
+
+    for command in ("inprogress", "done", "rm"):
+        result = invoke(path, command, task_id)
+        assert result.exit_code == 0
+        assert result.stdout == f"OK {task_id}\n"
+
+    missing = invoke(path, "done", task_id)
+    assert missing.exit_code == 1
+    assert missing.stdout == ""
+    assert missing.stderr.startswith("ERR ")
+    assert "╭" not in missing.output  # bez paneli Rich w potoku
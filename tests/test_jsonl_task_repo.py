@@ -0,0 +1,205 @@
+import pytest
+from datetime import datetime, timezone
+from notes.adapters.jsonl.task_repo import JsonlTaskRepository
+from notes.domain.task import Task, TaskId
+from notes.domain.enums import TaskStatus
+from notes.domain.errors import TaskNotFoundError, TaskAlreadyExistsError, TaskValidationError
+
+
+@pytest.fixture
+def tmp_repo(tmp_path):
+    """Repozytorium na świeżym tymczasowym pliku JSONL."""
+    return JsonlTaskRepository(tmp_path / "tasks.jsonl", durable=False)
+
+
+def make_task(task_id: str, title: str = "Test") -> Task:
+    return Task(
+        task_id=TaskId(task_id),
+        title=title,
+        description="desc",
+        created_at=datetime.now(timezone.utc),
+        status=TaskStatus.OPEN,
+    )
+
+
+def test_add_and_get(tmp_repo):
+    task = make_task("id-1")
+    tmp_repo.add(task)
+
+    fetched = tmp_repo.get(TaskId("id-1"))
+    assert fetched == task
+
+
+def test_add_duplicate_raises(tmp_repo):
+    tmp_repo.add(make_task("dup-1"))
+    with pytest.raises(TaskAlreadyExistsError):
+        tmp_repo.add(make_task("dup-1"))
+
+
+def test_add_appends_single_line(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+
+    lines = tmp_repo.path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+
+
+def test_reloads_when_file_changed_externally(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    assert tmp_repo.count_all() == 1
+
+    # inna instancja (np. drugi proces) dopisuje zadanie
+    other = JsonlTaskRepository(tmp_repo.path, durable=False)
+    other.add(make_task("b"))
+
+    assert tmp_repo.exists(TaskId("b"))
+    assert tmp_repo.count_all() == 2
+
+
+def test_remove_and_compact(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+    tmp_repo.remove(TaskId("a"))
+    tmp_repo.compact()
+
+    with pytest.raises(TaskNotFoundError):
+        tmp_repo.get(TaskId("a"))
+    fresh = JsonlTaskRepository(tmp_repo.path)
+    assert [t.task_id for t in fresh.list_all()] == ["b"]
+
+
+def test_update_and_remove_are_appended_and_replayed(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+    tmp_repo.add(make_task("c"))
+    tmp_repo.add(make_task("d"))
+    task = tmp_repo.get(TaskId("a"))
+    tmp_repo.update(Task(
+        task_id=task.task_id,
+        title=task.title,
+        description=task.description,
+        created_at=task.created_at,
+        status=TaskStatus.CLOSED,
+    ))
+    tmp_repo.remove(TaskId("b"))
+
+    lines = tmp_repo.path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 6
+
+    fresh = JsonlTaskRepository(tmp_repo.path, durable=False)
+    assert fresh.get(TaskId("a")).status == TaskStatus.CLOSED
+    assert not fresh.exists(TaskId("b"))
+    assert fresh.count_all() == 3
+
+
+def test_log_is_compacted_when_mostly_dead(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+    tmp_repo.remove(TaskId("a"))
+    tmp_repo.remove(TaskId("b"))  # 4 rekordy, 0 żywych → kompakcja
+
+    assert tmp_repo.path.read_text(encoding="utf-8") == ""
+    assert tmp_repo.count_all() == 0
+
+
+def test_list_all_orders_out_of_order_inserts(tmp_repo):
+    early = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    late = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    tmp_repo.add(Task(task_id=TaskId("late"), title="L", created_at=late))
+    assert [t.task_id for t in tmp_repo.list_all()] == ["late"]
+
+    tmp_repo.add(Task(task_id=TaskId("early"), title="E", created_at=early))
+    tmp_repo.add(Task(task_id=TaskId("tie"), title="T", created_at=late))
+
+    assert [t.task_id for t in tmp_repo.list_all()] == ["early", "late", "tie"]
+    assert [t.task_id for t in tmp_repo.list_all(offset=1, limit=1)] == ["late"]
+
+
+def test_flush_every_buffers_until_flush(tmp_path):
+    repo = JsonlTaskRepository(tmp_path / "tasks.jsonl", durable=False, flush_every=10)
+    repo.add(make_task("a"))
+    repo.add(make_task("b"))
+
+    assert not repo.path.exists()
+    assert repo.count_all() == 2  # bufor jest widoczny dla odczytów
+
+    repo.flush()
+    fresh = JsonlTaskRepository(repo.path, durable=False)
+    assert fresh.count_all() == 2
+
+
+def test_appends_after_compaction_go_to_new_file(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+    tmp_repo.compact()  # podmiana pliku → deskryptor dopisywania musi zostać otwarty ponownie
+    tmp_repo.add(make_task("c"))
+    tmp_repo.close()
+
+    fresh = JsonlTaskRepository(tmp_repo.path, durable=False)
+    assert sorted(t.task_id for t in fresh.list_all()) == ["a", "b", "c"]
+
+
+def test_list_all_orders_by_title_with_tiebreaker(tmp_repo):
+    tmp_repo.add(make_task("c", title="B"))
+    tmp_repo.add(make_task("b", title="A"))
+    tmp_repo.add(make_task("a", title="B"))
+
+    assert [t.task_id for t in tmp_repo.list_all(order_by="title")] == ["b", "a", "c"]
+    assert [t.task_id for t in tmp_repo.list_all(offset=1, limit=1, order_by="title")] == ["a"]
+
+
+def test_list_after_pages_with_keyset_cursor(tmp_repo):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i, task_id in enumerate(["c", "a", "b"]):
+        tmp_repo.add(Task(task_id=TaskId(task_id), title=task_id, created_at=base.replace(second=i % 2)))
+
+    first, cursor = tmp_repo.list_after(None, 2)
+    assert [t.task_id for t in first] == ["b", "c"]
+
+    second, cursor = tmp_repo.list_after(cursor, 2)
+    assert [t.task_id for t in second] == ["a"]
+    assert cursor is None
+    with pytest.raises(TaskValidationError):
+        tmp_repo.list_after(None, 0)  # niepusta baza — bez IndexError
+
+
+def test_transition_status_is_appended_and_idempotent(tmp_repo):
+    tmp_repo.add(make_task("a"))
+    tmp_repo.add(make_task("b"))
+
+    assert tmp_repo.transition_status(TaskId("a"), TaskStatus.CLOSED).status == TaskStatus.CLOSED
+    tmp_repo.transition_status(TaskId("a"), TaskStatus.CLOSED)  # bez zmiany → bez zapisu
+    assert tmp_repo.transition_status(TaskId("nope"), TaskStatus.CLOSED) is None
+
+    assert len(tmp_repo.path.read_text(encoding="utf-8").splitlines()) == 3
+    fresh = JsonlTaskRepository(tmp_repo.path, durable=False)
+    assert fresh.get(TaskId("a")).status == TaskStatus.CLOSED
+
+
+def test_add_many_writes_batch_at_once_and_rejects_duplicates(tmp_path):
+    repo = JsonlTaskRepository(tmp_path / "tasks.jsonl", durable=False, flush_every=100)
+    repo.add_many([make_task("a"), make_task("b")])
+
+    assert len(repo.path.read_text(encoding="utf-8").splitlines()) == 2  # zapis mimo flush_every
+    with pytest.raises(TaskAlreadyExistsError):
+        repo.add_many([make_task("c"), make_task("a")])
+    assert not repo.exists(TaskId("c"))
+
+
+def test_list_after_keeps_key_index_across_appends_and_removes(tmp_repo):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i, task_id in enumerate(["a", "b", "c"]):
+        tmp_repo.add(Task(task_id=TaskId(task_id), title=task_id, created_at=base.replace(second=i)))
+    tmp_repo.list_after(None, 1)
+    keys = tmp_repo._keys
+
+    tmp_repo.add(Task(task_id=TaskId("d"), title="d", created_at=base.replace(second=9)))
+    tmp_repo.remove(TaskId("b"))
+    tmp_repo.transition_status(TaskId("c"), TaskStatus.CLOSED)
+
+    first, cursor = tmp_repo.list_after(None, 2)
+    assert tmp_repo._keys is keys  # indeks aktualizowany przyrostowo, bez przebudowy
+    assert [t.task_id for t in first] == ["a", "c"]
+    assert first[1].status == TaskStatus.CLOSED
+    rest, cursor = tmp_repo.list_after(cursor, 2)
+    assert [t.task_id for t in rest] == ["d"] and cursor is None
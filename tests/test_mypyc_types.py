@@ -0,0 +1,19 @@
+import pytest
+from pathlib import Path
+
+mypy_api = pytest.importorskip("mypy.api")
+
+ROOT = Path(__file__).resolve().parent.parent
+# ta sama lista co w setup.py — moduły kompilowane przez mypyc muszą przejść mypy
+MYPYC_MODULES = [
+    "notes/services/task_service.py",
+    "notes/adapters/memory/task_repo.py",
+]
+
+
+def test_mypyc_modules_type_check(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    stdout, stderr, status = mypy_api.run(
+        ["--explicit-package-bases", "--no-incremental", "--cache-dir", "/dev/null", *MYPYC_MODULES]
+    )
+    assert status == 0, stdout + stderr
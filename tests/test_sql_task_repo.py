@@ -1,10 +1,11 @@
 import pytest
+import sqlalchemy as db
 from datetime import datetime, timezone
 from pathlib import Path
 from notes.adapters.sql.task_repo import SqlTaskRepository
 from notes.domain.task import Task, TaskId
 from notes.domain.enums import TaskStatus
-from notes.domain.errors import TaskNotFoundError, TaskAlreadyExistsError
+from notes.domain.errors import TaskNotFoundError, TaskAlreadyExistsError, TaskValidationError
 
 
 @pytest.fixture
@@ -74,8 +75,8 @@ def test_list_and_count(tmp_repo):
     tmp_repo.add(t2)
 
     all_tasks = list(tmp_repo.list_all())
-    assert len(all_tasks) == 5
-    assert tmp_repo.count_all() == 5 ##because we add from other tests
+    assert len(all_tasks) == 2
+    assert tmp_repo.count_all() == 2
 
 
 def test_exists(tmp_repo):
@@ -83,3 +84,145 @@ def test_exists(tmp_repo):
     tmp_repo.add(task)
     assert tmp_repo.exists(TaskId("ex-1"))
     assert not tmp_repo.exists(TaskId("nope"))
+
+
+def test_add_many_inserts_all(tmp_repo):
+    tmp_repo.add_many([make_task("m1"), make_task("m2"), make_task("m3")])
+    assert tmp_repo.count_all() == 3
+
+
+def test_add_many_duplicate_rolls_back(tmp_repo):
+    tmp_repo.add(make_task("m1"))
+    with pytest.raises(TaskAlreadyExistsError):
+        tmp_repo.add_many([make_task("m2"), make_task("m1")])
+    assert not tmp_repo.exists(TaskId("m2"))
+
+
+def test_created_at_roundtrip_keeps_microseconds_and_order(tmp_repo):
+    whole = datetime(2025, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+    later = datetime(2025, 1, 1, 12, 0, 5, 1, tzinfo=timezone.utc)
+    tmp_repo.add(Task(task_id=TaskId("b"), title="B", created_at=later))
+    tmp_repo.add(Task(task_id=TaskId("a"), title="A", created_at=whole))
+
+    items = list(tmp_repo.list_all())
+    assert [t.created_at for t in items] == [whole, later]
+
+
+def test_list_after_pages_with_keyset_cursor(tmp_repo):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i, task_id in enumerate(["c", "a", "b"]):
+        tmp_repo.add(Task(task_id=TaskId(task_id), title=task_id, created_at=base.replace(second=i % 2)))
+    # kolejność: (s0, b), (s0, c), (s1, a)
+
+    first, cursor = tmp_repo.list_after(None, 2)
+    assert [t.task_id for t in first] == ["b", "c"]
+    assert cursor is not None
+
+    second, cursor = tmp_repo.list_after(cursor, 2)
+    assert [t.task_id for t in second] == ["a"]
+    assert cursor is None
+    with pytest.raises(TaskValidationError):
+        tmp_repo.list_after(None, 0)  # niepusta baza — bez IndexError
+
+
+def test_count_all_follows_writes_via_task_stats(tmp_repo):
+    tmp_repo.add_many([make_task("a"), make_task("b")])
+    tmp_repo.add(make_task("c"))
+    task = tmp_repo.get(TaskId("a"))
+    tmp_repo.update(Task(task_id=task.task_id, title=task.title, created_at=task.created_at, status=TaskStatus.CLOSED))
+    tmp_repo.remove(TaskId("b"))
+
+    assert tmp_repo.count_all() == 2
+    with tmp_repo.engine.connect() as conn:
+        stats = dict(conn.execute(db.select(tmp_repo.task_stats)).all())
+    assert stats == {0: 1, 2: 1}  # kody statusów: Open, Closed
+
+
+def test_task_stats_backfilled_for_existing_database(tmp_path):
+    db_path = tmp_path / "tasks.db"
+    repo = SqlTaskRepository(db_path)
+    repo.add_many([make_task("a"), make_task("b")])
+    with repo.engine.begin() as conn:  # baza sprzed task_stats: bez triggerów i liczników
+        conn.execute(db.text("DROP TRIGGER trg_tasks_stats_ins"))
+        conn.execute(db.delete(repo.task_stats))
+    repo.engine.dispose()
+
+    assert SqlTaskRepository(db_path).count_all() == 2
+
+
+def test_transition_status_updates_in_one_call(tmp_repo):
+    tmp_repo.add(make_task("a"))
+
+    task = tmp_repo.transition_status(TaskId("a"), TaskStatus.CLOSED)
+    assert task.status == TaskStatus.CLOSED
+    assert tmp_repo.get(TaskId("a")).status == TaskStatus.CLOSED
+    assert tmp_repo.transition_status(TaskId("a"), TaskStatus.CLOSED).status == TaskStatus.CLOSED
+    assert tmp_repo.transition_status(TaskId("missing"), TaskStatus.CLOSED) is None
+
+
+def test_set_status_reports_change_via_rowcount(tmp_repo):
+    tmp_repo.add(make_task("a"))
+
+    assert tmp_repo.set_status(TaskId("a"), TaskStatus.CLOSED) is True
+    assert tmp_repo.set_status(TaskId("a"), TaskStatus.CLOSED) is False  # strzeżony UPDATE → 0 wierszy
+    assert tmp_repo.get(TaskId("a")).status == TaskStatus.CLOSED
+    with pytest.raises(TaskNotFoundError):
+        tmp_repo.set_status(TaskId("missing"), TaskStatus.CLOSED)
+
+
+@pytest.mark.parametrize("order_by", ["created_at", "title"])
+def test_list_all_order_uses_index_without_sort(tmp_repo, order_by):
+    col = tmp_repo.tasks.c[order_by]
+    stmt = db.select(tmp_repo.tasks).order_by(col.asc(), tmp_repo.tasks.c.task_id.asc()).limit(20)
+    sql = str(stmt.compile(tmp_repo.engine, compile_kwargs={"literal_binds": True}))
+
+    with tmp_repo.engine.connect() as conn:
+        plan = " ".join(str(row[-1]) for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+    assert "USING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_list_all_with_total_returns_page_and_count(tmp_repo):
+    tmp_repo.add_many([make_task("a"), make_task("b"), make_task("c")])
+
+    items, total = tmp_repo.list_all_with_total(limit=2, offset=1)
+    assert [t.task_id for t in items] == [t.task_id for t in list(tmp_repo.list_all())[1:3]]
+    assert total == 3
+
+    assert tmp_repo.list_all_with_total(limit=2, offset=10) == ([], 3)
+
+
+def test_list_all_with_total_window_fallback(tmp_repo):
+    tmp_repo.add_many([make_task("a"), make_task("b"), make_task("c")])
+    tmp_repo._has_stats = False  # jak backend bez task_stats → COUNT(*) OVER ()
+    tmp_repo._prepare_statements()
+
+    items, total = tmp_repo.list_all_with_total(limit=1)
+    assert len(items) == 1
+    assert total == 3
+
+
+def test_text_status_database_is_migrated_to_integer_codes(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    engine = db.create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:  # schemat sprzed migracji: status jako TEXT
+        conn.exec_driver_sql(
+            "CREATE TABLE tasks (task_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, "
+            "description VARCHAR, created_at VARCHAR NOT NULL, status VARCHAR NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO tasks VALUES ('a', 'A', NULL, '2025-01-01T00:00:00.000000Z', 'Closed'), "
+            "('b', 'B', NULL, '2025-01-02T00:00:00.000000Z', 'In Progress')"
+        )
+    engine.dispose()
+
+    repo = SqlTaskRepository(db_path)
+
+    assert repo.get(TaskId("a")).status == TaskStatus.CLOSED
+    assert repo.get(TaskId("b")).status == TaskStatus.IN_PROGRESS
+    assert repo.count_all() == 2
+    with repo.engine.connect() as conn:
+        types = {row[1]: row[2] for row in conn.exec_driver_sql("PRAGMA table_info(tasks)")}
+    assert types["status"] == "INTEGER"
+    assert [t.task_id for t in repo.list_all(order_by="title")] == ["a", "b"]
@@ -1,7 +1,8 @@
 from notes.adapters.memory.task_repo import InMemoryTaskRepository
 from notes.services.task_service import TaskService
 from notes.domain.task import Task
-from notes.domain.errors import TaskNotFoundError
+from notes.domain.enums import TaskStatus
+from notes.domain.errors import TaskNotFoundError, TaskValidationError, TaskAlreadyExistsError
 import pytest
 from datetime import datetime, timezone, timedelta
 
@@ -13,6 +14,8 @@ class FakeIdProvider:
     def new_id(self) -> str:
         self.counter += 1
         return f"id-{self.counter}"
+    def new_ids(self, n: int) -> list[str]:
+        return [self.new_id() for _ in range(n)]
 
 class FakeClock:
     def __init__(self, fixed: datetime | None = None):
@@ -197,3 +200,231 @@ def test_create_uses_clock_time():
     t = svc.create_task("A")
     assert t.created_at == clock.fixed
 
+
+
+def test_list_pages_match_full_sort():
+    repo = InMemoryTaskRepository()
+    svc = TaskService(repo, FakeIdProvider(), FakeClock())
+    for i in range(30):
+        svc.create_task(f"T{i}")
+
+    everything = list(repo.list_all())
+    page, total = svc.list_tasks(page=2, page_size=3)
+
+    assert total == 30
+    assert page == everything[3:6]
+
+
+def test_list_orders_tasks_created_out_of_order():
+    early = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    late = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    repo = InMemoryTaskRepository()
+    repo.add(Task(task_id="b", title="B", created_at=late))
+    repo.add(Task(task_id="a", title="A", created_at=early))
+
+    assert [t.task_id for t in repo.list_all()] == ["a", "b"]
+    assert [t.task_id for t in repo.list_all(order_by="title")] == ["a", "b"]
+
+def test_create_tasks_bulk_reads_clock_once_and_keeps_order():
+    class CountingClock(FakeClock):
+        calls = 0
+        def now(self) -> datetime:
+            self.calls += 1
+            return super().now()
+
+    clock = CountingClock()
+    service = TaskService(InMemoryTaskRepository(), FakeIdProvider(), clock)
+
+    created = service.create_tasks_bulk([("C", None), ("A", "x"), ("B", None)])
+
+    assert clock.calls == 1
+    assert [t.title for t in created] == ["C", "A", "B"]  # zwracana lista w kolejności wejścia
+    assert {t.created_at for t in created} == {clock.fixed}  # bez przesunięć w przyszłość
+    items, total = service.list_tasks()
+    assert total == 3
+    assert [t.title for t in items] == ["C", "A", "B"]
+    assert [t.task_id for t in items] == [t.task_id for t in created]
+
+def test_create_tasks_bulk_with_uuid_ids_lists_in_input_order():
+    service = TaskService(InMemoryTaskRepository(), UuidIdProvider(), FakeClock())
+    titles = [f"T{i}" for i in range(300, 0, -1)]  # celowo nie w kolejności alfabetycznej
+
+    created = service.create_tasks_bulk((title, None) for title in titles)
+
+    assert len({t.task_id for t in created}) == len(titles)
+    assert all(len(t.task_id) == 32 for t in created)
+    assert len({t.task_id[:8] for t in created}) == len(titles)  # skrócone ID w CLI też rozróżnialne
+    items, _ = service.list_tasks(page_size=len(titles))
+    assert [t.title for t in items] == titles  # wspólny created_at → o kolejności decyduje task_id
+
+def test_create_tasks_bulk_validates_before_saving():
+    service = TaskService(InMemoryTaskRepository(), FakeIdProvider(), FakeClock())
+
+    with pytest.raises(TaskValidationError):
+        service.create_tasks_bulk([("ok", None), ("  ", None)])
+
+    assert service.list_tasks()[1] == 0
+
+class CountingRepo(InMemoryTaskRepository):
+    """Repo, które udaje duży zbiór i liczy wywołania count_all."""
+    def __init__(self, fake_total: int):
+        super().__init__()
+        self.fake_total = fake_total
+        self.count_calls = 0
+    def count_all(self) -> int:
+        self.count_calls += 1
+        return self.fake_total
+
+def test_list_caches_large_count_until_mutation():
+    repo = CountingRepo(fake_total=5000)
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+
+    service.list_tasks(page=1)
+    service.list_tasks(page=2)
+    assert repo.count_calls == 1
+
+    service.create_task("nowe")  # unieważnia cache
+    service.list_tasks(page=1)
+    assert repo.count_calls == 2
+
+def test_list_does_not_cache_small_count():
+    repo = CountingRepo(fake_total=10)
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+
+    service.list_tasks(page=2)  # poza zapamiętaną pierwszą stroną
+    service.list_tasks(page=2)
+    assert repo.count_calls == 2
+
+def test_list_tasks_after_walks_all_pages_in_order():
+    repo = InMemoryTaskRepository()
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    for i in range(5):
+        service.create_task(f"T{i}")
+    expected = [t.task_id for t in service.list_tasks(page_size=10)[0]]
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = service.list_tasks_after(cursor, page_size=2)
+        seen += [t.task_id for t in items]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+def test_list_tasks_after_rejects_bad_page_size():
+    service = TaskService(InMemoryTaskRepository(), FakeIdProvider(), FakeClock())
+    with pytest.raises(TaskValidationError):
+        service.list_tasks_after(None, page_size=0)
+
+class GetCountingRepo(InMemoryTaskRepository):
+    def __init__(self):
+        super().__init__()
+        self.get_calls = 0
+    def get(self, task_id):
+        self.get_calls += 1
+        return super().get(task_id)
+
+def test_get_task_uses_identity_map_until_cleared():
+    repo = GetCountingRepo()
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    task = service.create_task("A")
+
+    assert service.get_task(task.task_id) is task
+    service.mark_done(task.task_id)
+    assert service.get_task(task.task_id).status == TaskStatus.CLOSED
+    assert repo.get_calls == 0
+
+    service.clear_cache()
+    service.get_task(task.task_id)
+    assert repo.get_calls == 1
+
+    service.remove_task(task.task_id)
+    with pytest.raises(TaskNotFoundError):
+        service.get_task(task.task_id)
+
+def test_mark_done_on_known_task_writes_without_reading():
+    class StatusRepo(GetCountingRepo):
+        def transition_status(self, task_id, new_status):
+            raise AssertionError("znane zadanie → set_status, bez zwracania rekordu")
+
+    repo = StatusRepo()
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    task = service.create_task("A")
+
+    done = service.mark_done(task.task_id)
+    assert done.status == TaskStatus.CLOSED and done.title == "A"
+    assert service.mark_done(task.task_id) is done  # bez zmiany → ten sam obiekt
+    assert repo.get(task.task_id).status == TaskStatus.CLOSED
+    assert repo.get_calls == 1  # tylko odczyt z asercji powyżej
+
+    repo.remove(task.task_id)  # usunięte poza serwisem
+    with pytest.raises(TaskNotFoundError):
+        service.mark_in_progress(task.task_id)
+
+def test_create_tasks_uses_single_add_many():
+    class BatchRepo(InMemoryTaskRepository):
+        batches = 0
+        def add(self, task):
+            raise AssertionError("oczekiwano add_many")
+        def add_many(self, tasks):
+            self.batches += 1
+            super().add_many(tasks)
+
+    repo = BatchRepo()
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    created = service.create_tasks([{"title": "A"}, {"title": "B", "description": "x"}])
+
+    assert repo.batches == 1
+    assert [t.title for t in service.list_tasks()[0]] == ["A", "B"]
+    assert created[1].description == "x"
+    with pytest.raises(TaskValidationError):
+        service.create_tasks([{"description": "bez tytułu"}])
+    assert repo.batches == 1
+
+def test_in_memory_list_after_rejects_non_positive_limit():
+    repo = InMemoryTaskRepository()
+    TaskService(repo, FakeIdProvider(), FakeClock()).create_task("A")
+
+    with pytest.raises(TaskValidationError):
+        repo.list_after(None, 0)
+
+def test_in_memory_add_many_is_all_or_nothing():
+    repo = InMemoryTaskRepository()
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    existing = service.create_task("A")
+    dup = Task(task_id=existing.task_id, title="B", created_at=existing.created_at)
+    fresh = Task(task_id="new", title="C", created_at=existing.created_at)
+
+    with pytest.raises(TaskAlreadyExistsError):
+        repo.add_many([fresh, dup])
+    assert not repo.exists("new")
+    assert [t.task_id for t in repo.list_all(order_by="title")] == [existing.task_id]
+
+def test_default_first_page_is_cached_until_mutation():
+    repo = CountingRepo(fake_total=10)
+    service = TaskService(repo, FakeIdProvider(), FakeClock())
+    task = service.create_task("A")
+
+    assert [t.task_id for t in service.list_tasks()[0]] == [task.task_id]
+    service.list_tasks()
+    assert repo.count_calls == 1
+
+    service.mark_done(task.task_id)  # mutacja unieważnia pierwszą stronę
+    items, _ = service.list_tasks()
+    assert items[0].status == TaskStatus.CLOSED
+    assert repo.count_calls == 2
+
+def test_uuid_ids_are_compact_hex():
+    service = TaskService(InMemoryTaskRepository(), UuidIdProvider(), FakeClock())
+    task = service.create_task("A")
+
+    assert len(task.task_id) == 32
+    int(task.task_id, 16)  # same cyfry szesnastkowe, bez myślników
+
+def test_list_forwards_order_by_to_repo():
+    service = TaskService(InMemoryTaskRepository(), FakeIdProvider(), FakeClock())
+    service.create_tasks_bulk([("B", None), ("C", None), ("A", None)])
+
+    items, total = service.list_tasks(page=1, page_size=2, order_by="title")
+    assert [t.title for t in items] == ["A", "B"]
+    assert total == 3